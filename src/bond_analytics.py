@@ -87,6 +87,43 @@ def year_fraction(start_date, end_date, day_count_convention="30/360"):
     else:
         raise ValueError("Unsupported day count convention.")
 
+def year_fractions(start_dates, end_dates, day_count_convention="30/360"):
+    """Vectorized version of year_fraction over arrays of dates.
+    Args:
+        start_dates (array-like): Start dates, broadcastable against end_dates.
+        end_dates (array-like): End dates, broadcastable against start_dates.
+        day_count_convention (str): The day count convention to use ("30/360", "ACT/360", "ACT/365", "ACT/ACT").
+    Returns:
+        np.ndarray: Year fractions with the broadcast shape of the inputs.
+    """
+    start = np.asarray(start_dates, dtype="datetime64[D]")
+    end = np.asarray(end_dates, dtype="datetime64[D]")
+    start, end = np.broadcast_arrays(start, end)
+    convention = day_count_convention.upper()
+
+    if convention == "30/360":
+        def split(dates):
+            months = dates.astype("datetime64[M]")
+            days = (dates - months).astype(int) + 1
+            return months.astype("datetime64[Y]").astype(int) + 1970, months.astype(int) % 12 + 1, np.minimum(days, 30)
+        y1, m1, d1 = split(start)
+        y2, m2, d2 = split(end)
+        return ((360 * (y2 - y1)) + (30 * (m2 - m1)) + (d2 - d1)) / 360.0
+
+    elif convention == "ACT/360":
+        return (end - start).astype(int) / 360.0
+
+    elif convention == "ACT/365":
+        return (end - start).astype(int) / 365.0
+
+    elif convention == "ACT/ACT":
+        # Year-by-year splitting does not vectorize cleanly; fall back to the scalar implementation
+        fractions = [year_fraction(pd.Timestamp(s), pd.Timestamp(e), convention) for s, e in zip(start.ravel(), end.ravel())]
+        return np.array(fractions, dtype=float).reshape(start.shape)
+
+    else:
+        raise ValueError("Unsupported day count convention.")
+
 def tenor_to_years(tenor):
     """Converts a tenor string to its equivalent in years.
     Args:
@@ -107,17 +144,15 @@ def tenor_to_years(tenor):
     else:
         raise ValueError(f"Unsupported tenor format: {tenor}")
 
-def generate_cashflows(settlement_date, maturity_date, coupon_rate, frequency = 2, face_value=100, business_day_convention="following"):
-    """Generates cashflows for a bond.
+def generate_cashflow_dates(settlement_date, maturity_date, frequency=2, business_day_convention="following"):
+    """Generates the business-day adjusted coupon dates of a bond.
     Args:
         settlement_date (pd.Timestamp): The settlement date of the bond.
         maturity_date (pd.Timestamp): The maturity date of the bond.
-        coupon_rate (float): The annual coupon rate as a decimal.
         frequency (int): Number of coupon payments per year.
-        face_value (float): The face value of the bond. Default is 100.
         business_day_convention (str): The business day convention to use. Default is "following".
     Returns:
-        pd.DataFrame: DataFrame containing the cashflow schedule.
+        list of pd.Timestamp: The sorted cashflow dates after settlement.
     """
     settlement_date = pd.Timestamp(settlement_date)
     maturity_date = pd.Timestamp(maturity_date)
@@ -137,7 +172,21 @@ def generate_cashflows(settlement_date, maturity_date, coupon_rate, frequency =
         current_date = pd.Timestamp(year=year, month=month, day=day)
 
     cashflow_dates = sorted(cashflow_dates)
-    cashflow_dates = [adjust_to_business_day(date, business_day_convention) for date in cashflow_dates]
+    return [adjust_to_business_day(date, business_day_convention) for date in cashflow_dates]
+
+def generate_cashflows(settlement_date, maturity_date, coupon_rate, frequency = 2, face_value=100, business_day_convention="following"):
+    """Generates cashflows for a bond.
+    Args:
+        settlement_date (pd.Timestamp): The settlement date of the bond.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        coupon_rate (float): The annual coupon rate as a decimal.
+        frequency (int): Number of coupon payments per year.
+        face_value (float): The face value of the bond. Default is 100.
+        business_day_convention (str): The business day convention to use. Default is "following".
+    Returns:
+        pd.DataFrame: DataFrame containing the cashflow schedule.
+    """
+    cashflow_dates = generate_cashflow_dates(settlement_date, maturity_date, frequency, business_day_convention)
     
     coupon = (coupon_rate / frequency) * face_value
     cashflows = np.full(len(cashflow_dates), coupon)
@@ -225,3 +274,83 @@ def price_duration_convexity(curve, settlement_date, maturity_date, coupon_rate,
         "convexity": convexity,
         "cash_flows": cash_flows_df
     }
+
+def price_from_zero_yields(zero_yields, t, cashflows, frequency=2, mask=None):
+    """Calculates price, duration, and convexity for a batch of curves given zero yields at the cashflow times.
+    Args:
+        zero_yields (np.ndarray): Array of shape (n_curves, n_cashflows) with the zero yield of each curve at each cashflow time.
+        t (np.ndarray): Year fractions to the cashflows, shape (n_cashflows,) or (n_curves, n_cashflows).
+        cashflows (np.ndarray): Cashflow amounts, shape (n_cashflows,) or (n_curves, n_cashflows).
+        frequency (int): Number of coupon payments per year.
+        mask (np.ndarray): Optional boolean array broadcastable to (n_curves, n_cashflows); False marks cashflows to ignore.
+    Returns:
+        dict: A dictionary of arrays of shape (n_curves,) containing the price, Macaulay duration, modified duration, and convexity.
+    """
+    zero_yields = np.asarray(zero_yields, dtype=float)
+    t = np.broadcast_to(np.asarray(t, dtype=float), zero_yields.shape)
+    cf = np.broadcast_to(np.asarray(cashflows, dtype=float), zero_yields.shape)
+    live = np.ones(zero_yields.shape, dtype=bool) if mask is None else np.broadcast_to(mask, zero_yields.shape)
+
+    df = np.where(live, np.exp(-zero_yields * t), 0.0)
+    present_values = cf * df
+    price = present_values.sum(axis=-1)
+
+    macaulay_duration = (present_values * t).sum(axis=-1) / price
+    # Same discount-factor weighted effective yield as price_duration_convexity
+    y_eff = (df * np.where(live, zero_yields, 0.0)).sum(axis=-1) / df.sum(axis=-1)
+    modified_duration = macaulay_duration / (1 + y_eff / frequency)
+
+    convexity = (present_values * t**2).sum(axis=-1) / price
+
+    return {
+        "price": price,
+        "macaulay_duration": macaulay_duration,
+        "modified_duration": modified_duration,
+        "convexity": convexity,
+    }
+
+def interpolation_weights(t, tenor_years):
+    """Builds the linear interpolation weights used by discount_factors (np.interp with flat extrapolation).
+    Interpolated yields are then a matrix product of the weights with the curve node yields.
+    Args:
+        t (np.ndarray): Year fractions of any shape.
+        tenor_years (np.ndarray): Sorted curve node maturities in years.
+    Returns:
+        np.ndarray: Weights of shape t.shape + (n_tenors,).
+    """
+    x = np.asarray(tenor_years, dtype=float)
+    t_clipped = np.clip(np.asarray(t, dtype=float), x[0], x[-1])
+    hi = np.clip(np.searchsorted(x, t_clipped, side="right"), 1, len(x) - 1)
+    lo = hi - 1
+    w_hi = (t_clipped - x[lo]) / (x[hi] - x[lo])
+    nodes = np.eye(len(x))
+    return nodes[lo] * (1 - w_hi)[..., None] + nodes[hi] * w_hi[..., None]
+
+def sort_curve_nodes(tenors):
+    """Orders curve tenor labels by maturity.
+    Args:
+        tenors (list of str): Tenor labels (e.g., the columns of a yield curve DataFrame).
+    Returns:
+        tuple: (order, tenor_years) where order sorts the tenors by maturity and tenor_years are the sorted maturities.
+    """
+    years = np.array([tenor_to_years(t) for t in tenors], dtype=float)
+    order = np.argsort(years, kind="stable")
+    return order, years[order]
+
+def batch_price_duration_convexity(curves, tenors, t, cashflows, frequency=2, mask=None):
+    """Calculates price, duration, and convexity for a batch of yield curves in one vectorized pass.
+    Args:
+        curves (np.ndarray): Curve node yields of shape (n_curves, n_tenors).
+        tenors (list of str): Tenor labels matching the last axis of curves.
+        t (np.ndarray): Year fractions to the cashflows, shape (n_cashflows,) or (n_curves, n_cashflows).
+        cashflows (np.ndarray): Cashflow amounts, shape (n_cashflows,) or (n_curves, n_cashflows).
+        frequency (int): Number of coupon payments per year.
+        mask (np.ndarray): Optional boolean array broadcastable to (n_curves, n_cashflows); False marks cashflows to ignore.
+    Returns:
+        dict: A dictionary of arrays of shape (n_curves,) with the same metrics as price_duration_convexity.
+    """
+    order, tenor_years = sort_curve_nodes(tenors)
+    curves = np.asarray(curves, dtype=float)[:, order]
+    weights = interpolation_weights(t, tenor_years)
+    zero_yields = (weights @ curves[..., None])[..., 0]
+    return price_from_zero_yields(zero_yields, t, cashflows, frequency, mask)
@@ -1,44 +1,81 @@
 import pandas as pd
+import numpy as np
 import os
+import sys
 from config_loader import load_config
 
+CHECKPOINT_FILE = "clean_checkpoint.npz"
+FFILL_LIMIT = 3
+
 def main():
-    """Main function to clean the combined data CSV file and save the cleaned data."""
-    
+    """Main function to clean the combined data CSV file and save the cleaned data.
+    Pass --incremental (or set clean_data.incremental in config.yml) to only process raw rows after the last clean date.
+    """
+
     config = load_config()
     cleaned_dir = config["data_directory"]["processed"]
     os.makedirs(cleaned_dir, exist_ok=True)
-    
+
+    if "--incremental" in sys.argv[1:] or config.get("clean_data", {}).get("incremental", False):
+        if clean_data_incremental(config):
+            return
+        print("No usable checkpoint, running a full clean.")
+
     # Clean the data
-    cleaned_data = clean_data(config)
-    
+    raw_data = read_raw_data(config)
+    cleaned_data = clean_raw_data(raw_data, config)
+
     # Save the cleaned data to a new CSV file
     save_cleaned_data(cleaned_data, cleaned_dir)
-    
+
     # Compute yield changes
     cleaned_data_diffs = compute_yield_changes(cleaned_data)
-    
+
     # Save the cleaned diffs to a new CSV file
     save_cleaned_diffs(cleaned_data_diffs, cleaned_dir)
 
-def clean_data(config):
-    """Reads data from the combined CSV file, ensure the columns being read are expected, and cleans the data.
+    save_checkpoint(build_checkpoint(raw_data, cleaned_data), cleaned_dir)
+
+def read_raw_data(config, skip_rows=0):
+    """Reads the combined CSV file and checks the expected columns are present.
     Args:
         config: Configuration dictionary containing paths.
+        skip_rows (int): Number of data rows at the top of the file to skip without parsing.
     Returns:
-        pd.DataFrame: A cleaned DataFrame with the expected columns.
+        pd.DataFrame: The raw data with a datetime date column.
     """
     path = os.path.join(config["data_directory"]["raw"], "combined_data.csv")
-    data = pd.read_csv(path, parse_dates=['date'])
+    data = pd.read_csv(path, parse_dates=['date'], skiprows=range(1, skip_rows + 1))
     expected_columns = ['date'] + list(config['tenors'].values())
     if not all(col in data.columns for col in expected_columns):
         raise ValueError(f"Data does not contain all expected columns: {expected_columns}")
     # Ensure the date column is in datetime format
     data['date'] = pd.to_datetime(data['date'], errors='coerce')
+    data.attrs["raw_rows"] = skip_rows + len(data)
+    return data
+
+def clean_data(config):
+    """Reads data from the combined CSV file, ensure the columns being read are expected, and cleans the data.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        pd.DataFrame: A cleaned DataFrame with the expected columns.
+    """
+    return clean_raw_data(read_raw_data(config), config)
+
+def clean_raw_data(data, config):
+    """Sorts, deduplicates, forward-fills and drops incomplete rows of the raw data.
+    Args:
+        data (pd.DataFrame): The raw data as returned by read_raw_data.
+        config: Configuration dictionary containing the tenor mapping.
+    Returns:
+        pd.DataFrame: A cleaned DataFrame indexed by date.
+    """
+    expected_columns = ['date'] + list(config['tenors'].values())
     # Sort by date and drop duplicate dates
     data = data.sort_values('date').drop_duplicates('date')
     # Forward fill missing values within 3 days
-    data = data.ffill(limit=3)
+    data = data.ffill(limit=FFILL_LIMIT)
     # Drop rows with NaN values in the data columns
     n_rows_before = data.shape[0]
     data.dropna(subset=expected_columns[1:], inplace=True)
@@ -49,6 +86,139 @@ def clean_data(config):
     data = data.set_index('date')
     return data
 
+def forward_fill_state(values):
+    """Returns the last observed value of each column and the number of missing rows after it.
+    Args:
+        values (np.ndarray): Raw values of shape (n_rows, n_columns), NaN where missing.
+    Returns:
+        tuple: (last_valid, nan_run) arrays of shape (n_columns,); last_valid is NaN for columns never observed.
+    """
+    n = len(values)
+    valid = ~np.isnan(values)
+    last_idx = np.where(valid.any(axis=0), n - 1 - np.argmax(valid[::-1], axis=0), -1)
+    last_valid = np.where(last_idx >= 0, values[np.maximum(last_idx, 0), np.arange(values.shape[1])], np.nan)
+    return last_valid, n - 1 - last_idx
+
+def forward_fill_from_state(values, last_valid, nan_run, limit=FFILL_LIMIT):
+    """Forward-fills new rows with at most limit consecutive fills, continuing from a saved fill state.
+    Gives the same result as DataFrame.ffill(limit=limit) over the full history, restricted to the new rows.
+    Args:
+        values (np.ndarray): New raw values of shape (n_rows, n_columns), NaN where missing.
+        last_valid (np.ndarray): Last observed value of each column before the new rows.
+        nan_run (np.ndarray): Missing rows after last_valid before the new rows.
+        limit (int): Maximum number of consecutive missing values to fill.
+    Returns:
+        tuple: (filled values, new last_valid, new nan_run).
+    """
+    n, k = values.shape
+    rows = np.arange(n)[:, None]
+    last_idx = np.maximum.accumulate(np.where(~np.isnan(values), rows, -1), axis=0)
+    seen = last_idx >= 0
+    carried = np.where(seen, values[np.maximum(last_idx, 0), np.arange(k)], last_valid)
+    gap = np.where(seen, rows - last_idx, nan_run + rows + 1)
+    filled = np.where(gap <= limit, carried, np.nan)
+    return filled, carried[-1], gap[-1]
+
+def build_checkpoint(raw_data, cleaned_data):
+    """Builds the typed state needed to continue cleaning from the end of the raw data.
+    Args:
+        raw_data (pd.DataFrame): The raw data as returned by read_raw_data (all rows consumed so far).
+        cleaned_data (pd.DataFrame): The cleaned data written so far.
+    Returns:
+        dict: Arrays to store with save_checkpoint.
+    """
+    raw_rows = raw_data.attrs["raw_rows"]
+    raw_data = raw_data.sort_values('date').drop_duplicates('date')
+    columns = [col for col in raw_data.columns if col != 'date']
+    last_valid, nan_run = forward_fill_state(raw_data[columns].to_numpy(dtype=float))
+    return {
+        "columns": np.array(columns),
+        "raw_rows": np.int64(raw_rows),
+        "last_raw_date": np.datetime64(raw_data['date'].max(), "ns"),
+        "last_valid": last_valid,
+        "nan_run": nan_run.astype(np.int64),
+        "last_clean_date": np.datetime64(cleaned_data.index[-1], "ns"),
+        "last_clean_values": cleaned_data[columns].to_numpy(dtype=float)[-1],
+    }
+
+def save_checkpoint(checkpoint, path):
+    """Saves the cleaning checkpoint as a binary .npz file next to the cleaned data.
+    Args:
+        checkpoint (dict): The state returned by build_checkpoint.
+        path (str): The processed data directory.
+    """
+    np.savez(os.path.join(path, CHECKPOINT_FILE), **checkpoint)
+
+def load_checkpoint(path):
+    """Loads the cleaning checkpoint.
+    Args:
+        path (str): The processed data directory.
+    Returns:
+        dict: The checkpoint arrays, or None if there is no checkpoint.
+    """
+    checkpoint_path = os.path.join(path, CHECKPOINT_FILE)
+    if not os.path.exists(checkpoint_path):
+        return None
+    with np.load(checkpoint_path) as f:
+        # [()] unwraps the 0-d arrays that savez stores for scalars
+        return {key: f[key][()] for key in f.files}
+
+def clean_data_incremental(config):
+    """Cleans only the raw rows after the checkpoint and appends them to the cleaned data and diffs.
+    The forward fill continues from the saved fill state, so the 3-day limit holds across the boundary, and
+    the first new change is taken against the last clean row. Rows dated on or before the last processed raw
+    date are ignored; a full run is needed to pick up revisions to history.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        bool: True if the incremental update ran, False if a full clean is needed instead.
+    """
+    cleaned_dir = config["data_directory"]["processed"]
+    checkpoint = load_checkpoint(cleaned_dir)
+    if checkpoint is None or not all(os.path.exists(os.path.join(cleaned_dir, name)) for name in ("cleaned_data.csv", "cleaned_data_diffs.csv")):
+        return False
+
+    # Re-read the last consumed row to check the raw file still lines up with the checkpoint
+    new_data = read_raw_data(config, skip_rows=int(checkpoint["raw_rows"]) - 1)
+    raw_rows = new_data.attrs["raw_rows"]
+    last_raw_date = pd.Timestamp(checkpoint["last_raw_date"])
+    columns = list(checkpoint["columns"])
+    if [col for col in new_data.columns if col != 'date'] != columns:
+        print("Raw columns changed since the checkpoint.")
+        return False
+    if new_data.empty or new_data['date'].iloc[0] != last_raw_date:
+        print("Raw file no longer lines up with the checkpoint.")
+        return False
+
+    new_data = new_data[new_data['date'] > last_raw_date]
+    new_data = new_data.sort_values('date', kind='stable').drop_duplicates('date')
+    checkpoint["raw_rows"] = np.int64(raw_rows)
+    if new_data.empty:
+        save_checkpoint(checkpoint, cleaned_dir)
+        print("No new raw rows since the last clean.")
+        return True
+
+    filled, last_valid, nan_run = forward_fill_from_state(new_data[columns].to_numpy(dtype=float), checkpoint["last_valid"], checkpoint["nan_run"])
+    tenor_pos = [columns.index(tenor) for tenor in config['tenors'].values()]
+    complete = ~np.isnan(filled[:, tenor_pos]).any(axis=1)
+    cleaned_new = pd.DataFrame(filled[complete], index=pd.DatetimeIndex(new_data['date'].to_numpy()[complete], name='date'), columns=columns)
+    print(f"Dropped {(~complete).sum()} rows with NaN values.")
+
+    if not cleaned_new.empty:
+        previous = pd.DataFrame([checkpoint["last_clean_values"]], index=pd.DatetimeIndex([checkpoint["last_clean_date"]], name='date'), columns=columns)
+        diffs_new = compute_yield_changes(pd.concat([previous, cleaned_new]))
+        cleaned_new.to_csv(os.path.join(cleaned_dir, 'cleaned_data.csv'), mode='a', header=False)
+        diffs_new.to_csv(os.path.join(cleaned_dir, 'cleaned_data_diffs.csv'), mode='a', header=False)
+        checkpoint["last_clean_date"] = np.datetime64(cleaned_new.index[-1], "ns")
+        checkpoint["last_clean_values"] = cleaned_new.to_numpy(dtype=float)[-1]
+
+    checkpoint["last_raw_date"] = np.datetime64(new_data['date'].max(), "ns")
+    checkpoint["last_valid"] = last_valid
+    checkpoint["nan_run"] = nan_run.astype(np.int64)
+    save_checkpoint(checkpoint, cleaned_dir)
+    print(f"Appended {len(cleaned_new)} cleaned rows up to {pd.Timestamp(checkpoint['last_clean_date']).date()}.")
+    return True
+
 def compute_yield_changes(df):
     """Computes daily changes in yields for a specified tenor.
     Args:
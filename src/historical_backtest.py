@@ -0,0 +1,91 @@
+import pandas as pd
+import os
+from config_loader import load_config
+from bond_analytics import generate_cashflows, year_fractions, batch_price_duration_convexity
+from key_rate_duration import compute_krd_batch, KEY_RATE_TENORS
+from rate_simulation import read_processed_data
+
+def main():
+    """Main function to compute the bond analytics history over every date in the cleaned data."""
+    config = load_config()
+    curves = read_processed_data(config)
+
+    analytics_df = run_backtest(
+        curves,
+        pd.to_datetime(config["bond"]["maturity_date"]),
+        config["bond"]["coupon_rate"],
+        config["bond"]["frequency"],
+        config["bond"]["face_value"],
+        config["bond"]["business_day_convention"],
+        config["bond"]["day_count_convention"],
+        config["monte_carlo"]["shock_size_bp"],
+    )
+
+    save_backtest_analytics(config, analytics_df)
+    print(f"Historical bond analytics computed for {len(analytics_df)} dates.")
+
+def run_backtest(curves, maturity_date, coupon_rate, frequency=2, face_value=100, business_day_convention="following", day_count_convention="ACT/365", shock_size_bp=1.0, tenors=KEY_RATE_TENORS, chunk_size=1000):
+    """Computes bond analytics for every curve date, settling the bond on each curve date.
+    A single cashflow schedule is generated from the first curve date; on each date the cashflows paid on or
+    before that date are masked out, so all dates are priced with array operations on the same schedule.
+    Args:
+        curves (pd.DataFrame): DataFrame of yield curves indexed by date with tenor columns.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        coupon_rate (float): The annual coupon rate as a decimal.
+        frequency (int): Number of coupon payments per year.
+        face_value (float): The face value of the bond. Default is 100.
+        business_day_convention (str): The business day convention to use. Default is "following".
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+        shock_size_bp (float): The size of the shock in basis points for the KRDs. Default is 1.0.
+        tenors (list of str): Tenors to compute key rate durations for.
+        chunk_size (int): Number of dates priced together.
+    Returns:
+        pd.DataFrame: A DataFrame containing bond analytics for each curve date.
+    """
+    maturity_date = pd.Timestamp(maturity_date)
+    curves = curves.sort_index()
+    curves = curves[curves.index < maturity_date]
+    if curves.empty:
+        raise ValueError("No curve dates before the bond maturity date.")
+
+    cash_flows_df = generate_cashflows(curves.index[0], maturity_date, coupon_rate, frequency, face_value, business_day_convention)
+    cf_dates = cash_flows_df["date"].to_numpy(dtype="datetime64[D]")
+    cf = cash_flows_df["cashflow_amount"].to_numpy(dtype=float)
+    curve_tenors = list(curves.columns)
+
+    results = []
+    for start in range(0, len(curves), chunk_size):
+        chunk = curves.iloc[start:start + chunk_size]
+        dates = chunk.index.to_numpy(dtype="datetime64[D]")
+        live = cf_dates[None, :] > dates[:, None]
+        t = year_fractions(dates[:, None], cf_dates[None, :], day_count_convention)
+        node_yields = chunk.to_numpy(dtype=float)
+
+        metrics = batch_price_duration_convexity(node_yields, curve_tenors, t, cf, frequency, live)
+        krd_vector = compute_krd_batch(node_yields, curve_tenors, tenors, t, cf, frequency, shock_size_bp, live)
+
+        result = pd.DataFrame({
+            "date": chunk.index,
+            "n_cashflows": live.sum(axis=1),
+            "price": metrics["price"],
+            "modified_duration": metrics["modified_duration"],
+            "convexity": metrics["convexity"],
+        })
+        for tenor, krd in krd_vector.items():
+            result[f"krd_{tenor}"] = krd
+        results.append(result)
+
+    return pd.concat(results, ignore_index=True)
+
+def save_backtest_analytics(config, analytics_df):
+    """Saves the historical bond analytics to CSV file.
+    Args:
+        config: Configuration dictionary containing paths.
+        analytics_df (pd.DataFrame): DataFrame containing the historical bond analytics.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    analytics_df.to_csv(os.path.join(reports_dir, "historical_bond_analytics.csv"), index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import pandas as pd
+import numpy as np
+from scipy.signal import lfilter
+
+def ewma_variance(diffs, ewma_lambda=0.94, warmup=30):
+    """Computes the EWMA variance forecast of each tenor for every day and for the day after the sample.
+    The forecast for day t only uses the changes before t: var[t] = lambda * var[t-1] + (1 - lambda) * diff[t-1]^2,
+    seeded with the mean squared change of the first warmup days.
+    Args:
+        diffs (np.ndarray): Daily yield changes of shape (n_days, n_tenors).
+        ewma_lambda (float): Decay factor. Default is 0.94 (RiskMetrics daily).
+        warmup (int): Number of days used to seed the recursion.
+    Returns:
+        tuple: (var, next_var) with var of shape (n_days, n_tenors) and next_var of shape (n_tenors,).
+    """
+    squared = diffs**2
+    seed = squared[:warmup].mean(axis=0)
+    filtered, _ = lfilter([1 - ewma_lambda], [1, -ewma_lambda], squared, axis=0, zi=ewma_lambda * seed[None, :])
+    var = np.vstack([seed[None, :], filtered[:-1]])
+    # Floor so tenors that never moved do not divide by zero
+    floor = np.finfo(float).eps * max(squared.max(), 1.0)
+    return np.maximum(var, floor), np.maximum(filtered[-1], floor)
+
+def bootstrap_indices(n_days, n_paths, n_steps, block_length):
+    """Draws the day index of every simulated step with a moving block bootstrap.
+    Args:
+        n_days (int): Number of historical daily changes to sample from.
+        n_paths (int): Number of paths.
+        n_steps (int): Number of steps per path.
+        block_length (int): Number of consecutive historical days in each block.
+    Returns:
+        np.ndarray: Integer array of shape (n_paths, n_steps) indexing the historical changes.
+    """
+    block_length = min(block_length, n_days)
+    n_blocks = -(-n_steps // block_length)
+    starts = np.random.randint(0, n_days - block_length + 1, size=(n_paths, n_blocks))
+    idx = starts[:, :, None] + np.arange(block_length)
+    return idx.reshape(n_paths, n_blocks * block_length)[:, :n_steps]
+
+def simulate_historical_paths(diffs, base_curve, n_paths, n_steps, block_length=5, ewma_lambda=None, chunk_size=10000, dtype=np.float64):
+    """Builds simulated curve paths from block-bootstrapped historical daily curve changes.
+    Whole-curve changes are sampled together so the cross-tenor correlation of each day is kept, and blocks of
+    consecutive days keep short-range autocorrelation. With ewma_lambda, changes are first standardised by their
+    EWMA volatility and then rescaled to the latest volatility forecast (filtered historical simulation).
+    Args:
+        diffs (np.ndarray): Historical daily yield changes of shape (n_days, n_tenors).
+        base_curve (np.ndarray): The curve the paths start from, shape (n_tenors,).
+        n_paths (int): Number of paths.
+        n_steps (int): Number of simulated days.
+        block_length (int): Number of consecutive historical days in each block.
+        ewma_lambda (float): EWMA decay for volatility rescaling; None uses the raw changes.
+        chunk_size (int): Number of paths generated together. Bounds the bootstrap temporaries only; the returned
+            array holds every path (n_paths * n_steps * n_tenors * itemsize bytes).
+        dtype (np.dtype): Dtype of the returned paths. Changes are accumulated in float64 either way.
+    Returns:
+        np.ndarray: Simulated curves of shape (n_paths, n_steps, n_tenors).
+    """
+    diffs = np.asarray(diffs, dtype=float)
+    base_curve = np.asarray(base_curve, dtype=float)
+    if ewma_lambda is not None:
+        var, next_var = ewma_variance(diffs, ewma_lambda)
+        diffs = diffs / np.sqrt(var) * np.sqrt(next_var)
+
+    paths = np.empty((n_paths, n_steps, diffs.shape[1]), dtype=dtype)
+    for start in range(0, n_paths, chunk_size):
+        stop = min(start + chunk_size, n_paths)
+        idx = bootstrap_indices(len(diffs), stop - start, n_steps, block_length)
+        paths[start:stop] = base_curve + np.cumsum(diffs[idx], axis=1)
+    return paths
+
+def simulate_historical_curves(processed_data, diffs, config):
+    """Simulates yield curves by block-bootstrapping the cleaned daily changes, in the rate_simulation output format.
+    Args:
+        processed_data (pd.DataFrame): DataFrame containing the processed yield curve data.
+        diffs (pd.DataFrame): DataFrame containing the cleaned daily yield changes.
+        config: Configuration dictionary containing the simulation parameters and historical_simulation section.
+    Returns:
+        pd.DataFrame: A DataFrame containing the simulated yield curves indexed by (date, sim_id).
+    """
+    # Imported here; rate_simulation dispatches to this module
+    from rate_simulation import paths_to_frame, storage_dtype
+
+    hs_config = config.get("historical_simulation", {})
+    tenors = list(processed_data.columns)
+    diffs = diffs[tenors]
+    lookback = hs_config.get("lookback_days")
+    if lookback:
+        diffs = diffs.iloc[-lookback:]
+
+    n_steps = config["simulation_horizon_days"]
+    # Built in the storage dtype so rate_simulation does not convert a second copy, unless the float32 report
+    # needs the float64 cube to compare against
+    dtype = storage_dtype(config)
+    if config.get("precision", {}).get("compare_float64", False):
+        dtype = np.dtype(np.float64)
+    paths = simulate_historical_paths(
+        diffs.to_numpy(dtype=float),
+        processed_data.to_numpy(dtype=float)[-1],
+        config["num_simulations"],
+        n_steps,
+        hs_config.get("block_length", 5),
+        hs_config.get("ewma_lambda"),
+        hs_config.get("chunk_size", 10000),
+        dtype,
+    )
+
+    last_date = processed_data.index[-1]
+    simulated_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=n_steps, freq='B')
+    return paths_to_frame(paths, simulated_dates, tenors)
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 from copy import deepcopy
-from bond_analytics import price_duration_convexity
+from bond_analytics import price_duration_convexity, price_from_zero_yields, interpolation_weights, sort_curve_nodes
 from config_loader import load_config
 
 config = load_config()
@@ -72,6 +72,102 @@ def compute_krd_vector(curve, tenors, settlement_date, maturity_date, coupon_rat
         krd_vector[tenor] = krd
     return krd_vector
 
+def compute_krd_batch(curves, curve_tenors, tenors, t, cashflows, frequency=2, shock_size_bp=1.0, mask=None):
+    """Computes key rate durations for a batch of yield curves without rebuilding any curve.
+    Bumping a curve node moves the interpolated cashflow yields by shock * interpolation weight, so the
+    bumped prices of every curve are obtained directly from the interpolated yields.
+    Args:
+        curves (np.ndarray): Curve node yields of shape (n_curves, n_tenors).
+        curve_tenors (list of str): Tenor labels matching the last axis of curves.
+        tenors (list of str): List of tenors to compute key rate durations for (e.g., ["1Y", "2Y", "5Y"]).
+        t (np.ndarray): Year fractions to the cashflows, shape (n_cashflows,) or (n_curves, n_cashflows).
+        cashflows (np.ndarray): Cashflow amounts, shape (n_cashflows,) or (n_curves, n_cashflows).
+        frequency (int): Number of coupon payments per year.
+        shock_size_bp (float): The size of the shock in basis points. Default is 1.0.
+        mask (np.ndarray): Optional boolean array broadcastable to (n_curves, n_cashflows); False marks cashflows to ignore.
+    Returns:
+        dict: A dictionary where keys are tenors and values are arrays of key rate durations of shape (n_curves,).
+    """
+    if shock_size_bp == 0:
+        raise ValueError("shock_size_bp must be non-zero to compute key rate duration.")
+    missing = [tenor for tenor in tenors if tenor not in curve_tenors]
+    if missing:
+        raise ValueError(f"Tenors {missing} not found in the yield curve.")
+
+    order, tenor_years = sort_curve_nodes(curve_tenors)
+    sorted_tenors = [curve_tenors[i] for i in order]
+    curves = np.asarray(curves, dtype=float)[:, order]
+    weights = interpolation_weights(t, tenor_years)
+    zero_yields = (weights @ curves[..., None])[..., 0]
+    shock = shock_size_bp / 10000.0
+
+    P0 = price_from_zero_yields(zero_yields, t, cashflows, frequency, mask)["price"]
+    krd_vector = {}
+    for tenor in tenors:
+        bump = shock * weights[..., sorted_tenors.index(tenor)]
+        P_plus = price_from_zero_yields(zero_yields + bump, t, cashflows, frequency, mask)["price"]
+        P_minus = price_from_zero_yields(zero_yields - bump, t, cashflows, frequency, mask)["price"]
+        krd_vector[tenor] = (P_minus - P_plus) / (2 * shock * P0)
+    return krd_vector
+
+def compute_krd_gamma_batch(curves, curve_tenors, tenors, t, cashflows, mask=None):
+    """Computes the key rate convexity (cross-gamma) matrix for a batch of yield curves in one pass.
+    Interpolated cashflow yields are linear in the curve nodes (y = W @ nodes), so the second derivative of the
+    price is sum_j PV_j * t_j^2 * W_ja * W_jb and needs no bumped repricing.
+    Args:
+        curves (np.ndarray): Curve node yields of shape (n_curves, n_tenors).
+        curve_tenors (list of str): Tenor labels matching the last axis of curves.
+        tenors (list of str): Key rate tenors spanning the gamma matrix (e.g., ["1Y", "2Y", "5Y"]).
+        t (np.ndarray): Year fractions to the cashflows, shape (n_cashflows,) or (n_curves, n_cashflows).
+        cashflows (np.ndarray): Cashflow amounts, shape (n_cashflows,) or (n_curves, n_cashflows).
+        mask (np.ndarray): Optional boolean array broadcastable to (n_curves, n_cashflows); False marks cashflows to ignore.
+    Returns:
+        np.ndarray: Gamma matrices (1/P) d2P/dy_a dy_b of shape (n_curves, n_key_tenors, n_key_tenors).
+    """
+    missing = [tenor for tenor in tenors if tenor not in curve_tenors]
+    if missing:
+        raise ValueError(f"Tenors {missing} not found in the yield curve.")
+
+    order, tenor_years = sort_curve_nodes(curve_tenors)
+    sorted_tenors = [curve_tenors[i] for i in order]
+    curves = np.asarray(curves, dtype=float)[:, order]
+    weights = interpolation_weights(t, tenor_years)
+    zero_yields = (weights @ curves[..., None])[..., 0]
+
+    t = np.broadcast_to(np.asarray(t, dtype=float), zero_yields.shape)
+    cf = np.broadcast_to(np.asarray(cashflows, dtype=float), zero_yields.shape)
+    live = np.ones(zero_yields.shape, dtype=bool) if mask is None else np.broadcast_to(mask, zero_yields.shape)
+    present_values = np.where(live, cf * np.exp(-zero_yields * t), 0.0)
+
+    key_weights = np.broadcast_to(weights[..., [sorted_tenors.index(tenor) for tenor in tenors]], zero_yields.shape + (len(tenors),))
+    gamma = np.einsum("nj,nja,njb->nab", present_values * t**2, key_weights, key_weights)
+    return gamma / present_values.sum(axis=-1)[:, None, None]
+
+def compute_node_sensitivities(curve, curve_tenors, t, cashflows):
+    """Computes the price and its analytic derivatives with respect to every curve node for a single curve.
+    Args:
+        curve (np.ndarray): Curve node yields of shape (n_tenors,).
+        curve_tenors (list of str): Tenor labels matching curve.
+        t (np.ndarray): Year fractions to the cashflows, shape (n_cashflows,).
+        cashflows (np.ndarray): Cashflow amounts, shape (n_cashflows,).
+    Returns:
+        dict: The price, the node gradient (n_tenors,), the node Hessian (n_tenors, n_tenors), the interpolation
+        weights (n_cashflows, n_tenors) and the third-order cashflow terms PV * t^3 (n_cashflows,), all in curve_tenors order.
+    """
+    order, tenor_years = sort_curve_nodes(curve_tenors)
+    weights = np.empty((len(t), len(curve_tenors)))
+    weights[:, order] = interpolation_weights(t, tenor_years)
+
+    t = np.asarray(t, dtype=float)
+    present_values = np.asarray(cashflows, dtype=float) * np.exp(-(weights @ np.asarray(curve, dtype=float)) * t)
+    return {
+        "price": present_values.sum(),
+        "gradient": -(present_values * t) @ weights,
+        "hessian": weights.T @ ((present_values * t**2)[:, None] * weights),
+        "weights": weights,
+        "third_order": present_values * t**3,
+    }
+
 def prepare_krd_for_plot(krd_vector, tenors=KEY_RATE_TENORS):
     """Prepares key rate duration vectors for plotting.
     Args:
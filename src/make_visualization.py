@@ -1,11 +1,16 @@
 import os
 import pandas as pd
+import matplotlib
+# Non-interactive backend, set before pyplot is imported so worker processes inherit it
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 from config_loader import load_config
-from monte_carlo_risk import compute_mc_analytics
 from visualization import (
     plot_distribution,
     plot_krd_bar,
     plot_krd_fan,
+    plot_krd_fan_bands,
     plot_yield_curves,
     plot_term_premium_shifts
 )
@@ -14,57 +19,79 @@ def ensure_dir(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
+def render_figure(task):
+    """Builds one figure, saves it and closes it.
+    Args:
+        task (tuple): (plot function, positional args, keyword args, output path, dpi).
+    Returns:
+        str: The output path.
+    """
+    plot_func, args, kwargs, path, dpi = task
+    fig = plot_func(*args, **kwargs)
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+    return path
+
+def render_figures(tasks, n_workers=1):
+    """Renders independent figures, in a process pool when n_workers > 1.
+    Args:
+        tasks (list of tuple): Tasks as accepted by render_figure.
+        n_workers (int): Number of worker processes.
+    Returns:
+        list of str: The output paths.
+    """
+    if n_workers <= 1 or len(tasks) <= 1:
+        return [render_figure(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+        return list(executor.map(render_figure, tasks))
+
 def main():
     """Main function to generate visualizations from Monte Carlo risk analytics."""
-    
+
     config = load_config()
     figures_dir = config["data_directory"]["figures"]
     reports_dir = config["data_directory"]["reports"]
+    viz_config = config["visualization"]
+    dpi = viz_config.get("dpi", 150)
+    bins = viz_config.get("histogram_bins", 50)
 
     ensure_dir(figures_dir)
     ensure_dir(reports_dir)
 
     date = config["monte_carlo"]["evaluation"]
     print(f"Using MC evaluation date: {date}")
-    
+
     mc_results_path = os.path.join(reports_dir, "simulated_yield_curve_analytics.csv")
     mc_df = pd.read_csv(mc_results_path)
-    
-    
-    # MC Distribution Plots
-    print("Generating MC distribution plots...")
+    krd_cols = [c for c in mc_df.columns if c.startswith("krd_")]
+    krd_df = mc_df[krd_cols]
 
-    price_hist = plot_distribution(mc_df, "price", title="MC Price Distribution")
-    mod_dur_hist = plot_distribution(mc_df, "modified_duration", title="MC Modified Duration Distribution")
-    conv_hist = plot_distribution(mc_df, "convexity", title="MC Convexity Distribution")
-    
-    # Save distribution plots
-    price_hist_path = os.path.join(figures_dir, "mc_price_distribution.png")
-    mod_dur_hist_path = os.path.join(figures_dir, "mc_modified_duration_distribution.png")
-    conv_hist_path = os.path.join(figures_dir, "mc_convexity_distribution.png")
-    price_hist.savefig(price_hist_path)
-    mod_dur_hist.savefig(mod_dur_hist_path)
-    conv_hist.savefig(conv_hist_path)
+    tasks = []
 
-    # KRD Fan Chart
-    print("Generating KRD fan chart...")
+    # MC Distribution Plots
+    for column, title, filename in [
+        ("price", "MC Price Distribution", "mc_price_distribution.png"),
+        ("modified_duration", "MC Modified Duration Distribution", "mc_modified_duration_distribution.png"),
+        ("convexity", "MC Convexity Distribution", "mc_convexity_distribution.png"),
+    ]:
+        tasks.append((plot_distribution, (mc_df[[column]], column), {"bins": bins, "title": title}, os.path.join(figures_dir, filename), dpi))
 
-    krd_cols = [c for c in mc_df.columns if c.startswith("krd_")]
-    krd_df = mc_df[krd_cols]
-    krd_fan = plot_krd_fan(krd_df, title="Monte Carlo Key Rate Duration Fan Chart")
-    
-    krd_fan_path = os.path.join(figures_dir, "mc_krd_fan_chart.png")
-    krd_fan.savefig(krd_fan_path)
+    # KRD Fan Chart
+    if viz_config.get("krd_fan_mode", "bands") == "bands":
+        fan_task = (plot_krd_fan_bands, (krd_df,), {"percentiles": viz_config.get("krd_fan_percentiles", [5, 25, 75, 95]), "title": "Monte Carlo Key Rate Duration Fan Chart"})
+    else:
+        fan_task = (plot_krd_fan, (krd_df,), {"title": "Monte Carlo Key Rate Duration Fan Chart"})
+    tasks.append(fan_task + (os.path.join(figures_dir, "mc_krd_fan_chart.png"), dpi))
 
     # Single KRD Vector Bar Chart
-    print("Plotting single KRD vector example...")
     first_krd = mc_df.iloc[0][krd_cols].to_dict()
-    krd_vec_plot = plot_krd_bar(first_krd, title="Single-Path KRD")
-    
-    krd_vec_path = os.path.join(figures_dir, "krd_vector_bar_chart.png")
-    krd_vec_plot.savefig(krd_vec_path)
+    tasks.append((plot_krd_bar, (first_krd,), {"title": "Single-Path KRD"}, os.path.join(figures_dir, "krd_vector_bar_chart.png"), dpi))
+
+    n_workers = viz_config.get("n_workers", 1)
+    print(f"Rendering {len(tasks)} figures with {n_workers} worker(s)...")
+    render_figures(tasks, n_workers)
     print("Visualization complete!")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
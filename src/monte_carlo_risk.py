@@ -2,8 +2,14 @@ from config_loader import load_config
 import numpy as np
 import pandas as pd
 import os
-from key_rate_duration import compute_krd_vector, KEY_RATE_TENORS
-from bond_analytics import price_duration_convexity
+from concurrent.futures import ProcessPoolExecutor
+from key_rate_duration import compute_krd_batch, compute_krd_gamma_batch, compute_node_sensitivities, KEY_RATE_TENORS
+from bond_analytics import generate_cashflows, year_fractions, batch_price_duration_convexity
+from rate_simulation import read_processed_data, simulated_curves_to_cube, storage_dtype, storage_float_format
+from shared_cube import attach_cube, release_cube, attach_shared_cube, load_simulated_cube, build_sim_curve_index, load_sim_curve_index, sim_curves_on_date, resolve_sim_date_position
+
+# Columns of the per-path delta-gamma diagnostic report
+DELTA_GAMMA_DIAGNOSTICS = ["date", "sim_id", "price", "approximated", "error_estimate", "max_shift_bp"]
 
 def main():
     """Main function to compute Monte Carlo bond analytics."""
@@ -20,58 +26,176 @@ def main():
     day_count_convention = config["bond"]["day_count_convention"]
     shock_size_bp = config["monte_carlo"]["shock_size_bp"]
 
-    analytics_df = compute_mc_analytics(
-        config,
-        date,
-        settlement_date,
-        maturity_date,
-        coupon_rate,
-        frequency,
-        face_value,
-        business_day_convention,
-        day_count_convention,
-        shock_size_bp
-    )
-    
+    # Loaded once and shared by every analytic below
+    sim_index = load_sim_curve_index(config)
+
+    if config["monte_carlo"].get("revaluation", "full") == "delta_gamma":
+        revaluation_df = compute_mc_delta_gamma(config, date, settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention, shock_size_bp, sim_index)
+        save_delta_gamma_prices(config, revaluation_df[DELTA_GAMMA_DIAGNOSTICS])
+        print(f"Delta-gamma revaluation saved: {revaluation_df['approximated'].sum()} of {len(revaluation_df)} paths approximated.")
+        # Same layout as the full revaluation plus the approximated flag
+        analytics_df = revaluation_df.drop(columns=["error_estimate", "max_shift_bp"])
+    else:
+        analytics_df = compute_mc_analytics(
+            config,
+            date,
+            settlement_date,
+            maturity_date,
+            coupon_rate,
+            frequency,
+            face_value,
+            business_day_convention,
+            day_count_convention,
+            shock_size_bp,
+            sim_index,
+        )
+
     # Save the analytics results
     save_simulated_analytics(config, analytics_df)
     
     print("Monte Carlo bond analytics saved.")
 
+    if config["monte_carlo"].get("compute_krd_gamma", False):
+        gamma_df = compute_mc_krd_gamma(config, date, settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention, sim_index=sim_index)
+        save_krd_gamma(config, gamma_df)
+        print("Monte Carlo key rate gamma matrices saved.")
+
 def extract_sim_curve_on_date(sim_data, path_id, date):
-    """Extracts the yield curve for a specific date.
+    """Extracts the yield curve of one simulated path for a specific date.
+    A date that is not simulated resolves to the nearest previous simulated date within 5 days.
     Args:
-        sim_data (pd.DataFrame): DataFrame containing the simulated yield curves.
+        sim_data (pd.DataFrame or dict): DataFrame containing the simulated yield curves, or an index returned by
+            build_sim_curve_index (reuse it when extracting many curves).
         path_id: The path ID for the simulation.
         date (pd.Timestamp): The date for which to extract the yield curve.
     Returns:
         pd.DataFrame: A DataFrame containing the simulated yield curve for the specified date.
     """
-
-    if date not in sim_data.index.get_level_values(0):
-        print(f"Date {date} not found, searching for closest previous date...")
-        i = 5
-        found = False
-        while i > 0:
-            test_date = date - pd.Timedelta(days=i)
-            if test_date in sim_data.index.get_level_values(0):
-                date = test_date
-                print(f"Found closest previous date: {date}")
-                found = True
-                break
-            print(f"Date {date - pd.Timedelta(days=i)} not found, checking earlier...")
-            i -= 1
-        if not found:
-            raise ValueError(f"Date {date} not found in simulated yield curves.")
-    if path_id not in sim_data.index.get_level_values(1):
+    sim_index = sim_data if isinstance(sim_data, dict) else build_sim_curve_index(*simulated_curves_to_cube(sim_data))
+    path_pos = sim_index["path_pos"].get(path_id)
+    if path_pos is None:
         raise ValueError(f"Path ID {path_id} not found in simulated yield curves.")
-    
-    curve = sim_data.loc[[(date, path_id)]].reset_index(level=1, drop=True)
-    curve.index.name = "date"
-    
-    return curve
+    curve_date, date_pos = resolve_sim_date_position(sim_index["dates"], date)
+
+    return pd.DataFrame(
+        sim_index["cube"][date_pos, path_pos][None, :],
+        index=pd.DatetimeIndex([curve_date], name="date"),
+        columns=sim_index["tenors"],
+    )
+
+def compute_mc_krd_gamma(config, date, settlement_date, maturity_date, coupon_rate, frequency=2, face_value=100, business_day_convention="following", day_count_convention="ACT/365", tenors=KEY_RATE_TENORS, sim_index=None):
+    """Computes the key rate gamma matrix of the bond for every simulated path on the specified date.
+    Args:
+        config: Configuration dictionary containing paths.
+        date (pd.Timestamp): The date for which to compute the gamma matrices.
+        settlement_date (pd.Timestamp): The settlement date of the bond.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        coupon_rate (float): The annual coupon rate as a decimal.
+        frequency (int): Number of coupon payments per year.
+        face_value (float): The face value of the bond. Default is 100.
+        business_day_convention (str): The business day convention to use. Default is "following".
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+        tenors (list of str): Key rate tenors spanning the gamma matrix.
+        sim_index (dict): An already loaded index from build_sim_curve_index; loaded from config if None.
+    Returns:
+        pd.DataFrame: A DataFrame with one row per simulation path and one gamma_<a>_<b> column per tenor pair.
+    """
+    if sim_index is None:
+        sim_index = load_sim_curve_index(config)
+    sim_ids, curve_tenors = sim_index["sim_ids"], sim_index["tenors"]
+    curve_date, curves = sim_curves_on_date(sim_index, date)
+
+    cash_flows_df = generate_cashflows(settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention)
+    t = year_fractions(curve_date, cash_flows_df["date"].to_numpy(dtype="datetime64[D]"), day_count_convention)
+    gamma = compute_krd_gamma_batch(curves, curve_tenors, tenors, t, cash_flows_df["cashflow_amount"].to_numpy(dtype=float))
 
-def compute_mc_analytics(config, date, settlement_date, maturity_date, coupon_rate, frequency=2, face_value=100, business_day_convention="following", day_count_convention="ACT/365", shock_size_bp=1.0):
+    gamma_df = pd.DataFrame(
+        gamma.reshape(len(sim_ids), -1),
+        columns=[f"gamma_{a}_{b}" for a in tenors for b in tenors],
+    )
+    gamma_df.insert(0, "sim_id", sim_ids)
+    # The requested date, as in compute_mc_analytics, so the two reports join on (date, sim_id)
+    gamma_df.insert(0, "date", date)
+    return gamma_df
+
+def compute_mc_delta_gamma(config, date, settlement_date, maturity_date, coupon_rate, frequency=2, face_value=100, business_day_convention="following", day_count_convention="ACT/365", shock_size_bp=1.0, sim_index=None):
+    """Revalues the bond on every simulated path with a second-order Taylor expansion in the curve node yields.
+    Sensitivities are computed once around the cross-sectional mean curve on the date (or the last historical
+    curve) and every path price is approximated with one matrix product. Durations, convexity and KRDs come from
+    the same expansion: the node gradient at a path is gradient + hessian @ shift, and the parallel second
+    derivative is corrected by the third-order term. The third-order Taylor term also gives a per-path price
+    error estimate; paths whose estimate exceeds monte_carlo.delta_gamma_tolerance, or whose largest node shift
+    exceeds monte_carlo.delta_gamma_max_shift_bp, are fully repriced instead.
+    Args:
+        config: Configuration dictionary containing paths and the monte_carlo section.
+        date (pd.Timestamp): The date for which to revalue the bond.
+        settlement_date (pd.Timestamp): The settlement date of the bond.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        coupon_rate (float): The annual coupon rate as a decimal.
+        frequency (int): Number of coupon payments per year.
+        face_value (float): The face value of the bond. Default is 100.
+        business_day_convention (str): The business day convention to use. Default is "following".
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+        shock_size_bp (float): The size of the shock in basis points for the KRDs of fully repriced paths. Default is 1.0.
+        sim_index (dict): An already loaded index from build_sim_curve_index; loaded from config if None.
+    Returns:
+        pd.DataFrame: A DataFrame with the same analytics columns as compute_mc_analytics, whether each path was
+        approximated or fully repriced, its error estimate and its largest node shift in basis points.
+    """
+    mc_config = config["monte_carlo"]
+    if sim_index is None:
+        sim_index = load_sim_curve_index(config)
+    sim_ids, curve_tenors = sim_index["sim_ids"], sim_index["tenors"]
+    curve_date, curves = sim_curves_on_date(sim_index, date)
+
+    if mc_config.get("delta_gamma_base", "mean") == "historical":
+        base_curve = read_processed_data(config)[curve_tenors].to_numpy(dtype=float)[-1]
+    else:
+        base_curve = curves.mean(axis=0, dtype=float)
+
+    cash_flows_df = generate_cashflows(settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention)
+    t = year_fractions(curve_date, cash_flows_df["date"].to_numpy(dtype="datetime64[D]"), day_count_convention)
+    cf = cash_flows_df["cashflow_amount"].to_numpy(dtype=float)
+    sens = compute_node_sensitivities(base_curve, curve_tenors, t, cf)
+
+    shifts = curves - base_curve[None, :]
+    price = sens["price"] + shifts @ sens["gradient"] + 0.5 * np.einsum("pk,kl,pl->p", shifts, sens["hessian"], shifts)
+    cashflow_shifts = shifts @ sens["weights"].T
+    error_estimate = np.abs((cashflow_shifts**3) @ sens["third_order"]) / 6.0
+    max_shift_bp = np.abs(shifts).max(axis=1) * 10000.0
+
+    # Node gradient and parallel second derivative at each path, from the same expansion
+    gradient = sens["gradient"][None, :] + shifts @ sens["hessian"]
+    second_derivative = sens["hessian"].sum() - cashflow_shifts @ sens["third_order"]
+    base_zero = sens["weights"] @ base_curve
+    base_df = np.exp(-base_zero * t)
+    # Discount-factor weighted effective yield, as in price_from_zero_yields, with the base discount factors
+    y_eff = (base_zero[None, :] + cashflow_shifts) @ base_df / base_df.sum()
+    result = {
+        "price": price,
+        "modified_duration": -gradient.sum(axis=1) / price / (1 + y_eff / frequency),
+        "convexity": second_derivative / price,
+    }
+    for tenor in KEY_RATE_TENORS:
+        result[f"krd_{tenor}"] = -gradient[:, curve_tenors.index(tenor)] / price
+
+    approximated = (error_estimate <= mc_config["delta_gamma_tolerance"]) & (max_shift_bp <= mc_config["delta_gamma_max_shift_bp"])
+    if not approximated.all():
+        reprice = ~approximated
+        bond_args = (settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention)
+        full = price_sim_curves(curves[reprice], curve_tenors, curve_date, bond_args, shock_size_bp)
+        for key, values in full.items():
+            result[key][reprice] = values
+
+    revaluation_df = pd.DataFrame(result)
+    revaluation_df.insert(0, "sim_id", sim_ids)
+    revaluation_df.insert(0, "date", date)
+    revaluation_df["approximated"] = approximated
+    revaluation_df["error_estimate"] = error_estimate
+    revaluation_df["max_shift_bp"] = max_shift_bp
+    return revaluation_df
+
+def compute_mc_analytics(config, date, settlement_date, maturity_date, coupon_rate, frequency=2, face_value=100, business_day_convention="following", day_count_convention="ACT/365", shock_size_bp=1.0, sim_index=None):
     """Computes bond analytics across all simulated yield curves for specified date.
     Args:
         config: Configuration dictionary containing paths.
@@ -84,41 +208,179 @@ def compute_mc_analytics(config, date, settlement_date, maturity_date, coupon_ra
         business_day_convention (str): The business day convention to use. Default is "following".
         day_count_convention (str): The day count convention to use. Default is "ACT/365".
         shock_size_bp (float): The size of the shock in basis points. Default is 1.0.
+        sim_index (dict): An already loaded index from build_sim_curve_index; loaded from config if None.
     Returns:
         pd.DataFrame: A DataFrame containing bond analytics for each simulation path.
     """
-    sim_curves_path = os.path.join(config["data_directory"]["simulations"], "simulated_yield_curves.csv")
-    curve_df = pd.read_csv(sim_curves_path, index_col=[0,1], parse_dates=[0])
-    sim_ids = curve_df.index.get_level_values(1).unique()
-    
-    results = []
-    for sim_id in sim_ids:
-        curve_df_single = extract_sim_curve_on_date(curve_df, sim_id, date)
-        price_duration_convexity_res = price_duration_convexity(curve_df_single, settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention)
-        krd_vector = compute_krd_vector(curve_df_single, KEY_RATE_TENORS, settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention, shock_size_bp)
-        
-        result = {
-            "date": date,
-            "sim_id": sim_id,
-            "price": price_duration_convexity_res["price"],
-            "modified_duration": price_duration_convexity_res["modified_duration"],
-            "convexity": price_duration_convexity_res["convexity"],
-        }
-        for tenor, krd in krd_vector.items():
-            result[f"krd_{tenor}"] = krd
-        results.append(result)
-        
-    return pd.DataFrame(results)
+    n_workers = config["monte_carlo"].get("n_workers", 1)
+    if n_workers > 1 and attach_shared_cube(config) is not None:
+        return compute_mc_analytics_shared(config, date, settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention, shock_size_bp, n_workers)
+
+    if sim_index is None:
+        sim_index = load_sim_curve_index(config)
+    curve_date, curves = sim_curves_on_date(sim_index, date)
+    bond_args = (settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention)
+
+    analytics_df = pd.DataFrame(price_sim_curves(curves, sim_index["tenors"], curve_date, bond_args, shock_size_bp))
+    analytics_df.insert(0, "sim_id", sim_index["sim_ids"])
+    analytics_df.insert(0, "date", date)
+    return analytics_df
+
+def price_sim_curves(curves, curve_tenors, curve_date, bond_args, shock_size_bp=1.0):
+    """Prices the bond on a batch of simulated curves in one vectorized pass.
+    Args:
+        curves (np.ndarray): Curve node yields of shape (n_paths, n_tenors).
+        curve_tenors (list of str): Tenor labels matching the last axis of curves.
+        curve_date (pd.Timestamp): The date of the curves.
+        bond_args (tuple): Settlement date, maturity date, coupon rate, frequency, face value, business day and day count conventions.
+        shock_size_bp (float): The size of the shock in basis points. Default is 1.0.
+    Returns:
+        dict: Arrays of price, modified duration, convexity and one KRD array per key rate tenor.
+    """
+    settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention = bond_args
+    cash_flows_df = generate_cashflows(settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention)
+    t = year_fractions(curve_date, cash_flows_df["date"].to_numpy(dtype="datetime64[D]"), day_count_convention)
+    cf = cash_flows_df["cashflow_amount"].to_numpy(dtype=float)
+    metrics = batch_price_duration_convexity(curves, curve_tenors, t, cf, frequency)
+    krd_vector = compute_krd_batch(curves, curve_tenors, KEY_RATE_TENORS, t, cf, frequency, shock_size_bp)
+
+    result = {key: metrics[key] for key in ("price", "modified_duration", "convexity")}
+    for tenor, krd in krd_vector.items():
+        result[f"krd_{tenor}"] = krd
+    return result
+
+def _mc_analytics_worker(args):
+    """Prices one slice of paths on one date against the published shared memory cube.
+    Args:
+        args (tuple): (config, date_pos, start, stop, curve_date, bond_args, shock_size_bp) where bond_args are the
+            settlement date, maturity date, coupon rate, frequency, face value, business day and day count conventions.
+    Returns:
+        dict: Arrays of price, modified duration, convexity and one KRD array per key rate tenor for the slice.
+    """
+    config, date_pos, start, stop, curve_date, bond_args, shock_size_bp = args
+
+    attached = attach_cube(config)
+    if attached is None:
+        raise RuntimeError("Shared memory cube is no longer published.")
+    curves = np.array(attached["cube"][date_pos, start:stop], dtype=float)
+    curve_tenors = attached["tenors"]
+    release_cube(attached)
+
+    return price_sim_curves(curves, curve_tenors, curve_date, bond_args, shock_size_bp)
+
+def compute_mc_analytics_shared(config, date, settlement_date, maturity_date, coupon_rate, frequency=2, face_value=100, business_day_convention="following", day_count_convention="ACT/365", shock_size_bp=1.0, n_workers=4):
+    """Computes bond analytics across all simulated yield curves with worker processes attached to the shared memory cube.
+    Each worker attaches to the published cube by name, so no process holds its own copy of the simulations.
+    Args:
+        config: Configuration dictionary containing paths.
+        date (pd.Timestamp): The date for which to compute bond analytics.
+        settlement_date (pd.Timestamp): The settlement date of the bond.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        coupon_rate (float): The annual coupon rate as a decimal.
+        frequency (int): Number of coupon payments per year.
+        face_value (float): The face value of the bond. Default is 100.
+        business_day_convention (str): The business day convention to use. Default is "following".
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+        shock_size_bp (float): The size of the shock in basis points. Default is 1.0.
+        n_workers (int): Number of worker processes.
+    Returns:
+        pd.DataFrame: A DataFrame containing bond analytics for each simulation path.
+    """
+    dates, sim_ids, _, _ = load_simulated_cube(config)
+    curve_date, date_pos = resolve_sim_date_position(dates, date)
+    bond_args = (settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention, day_count_convention)
+
+    bounds = np.linspace(0, len(sim_ids), n_workers + 1).astype(int)
+    tasks = [(config, date_pos, start, stop, curve_date, bond_args, shock_size_bp) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        chunks = list(executor.map(_mc_analytics_worker, tasks))
+
+    analytics_df = pd.DataFrame({key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]})
+    analytics_df.insert(0, "sim_id", sim_ids)
+    analytics_df.insert(0, "date", date)
+    return analytics_df
+
+def compare_storage_precision(config, simulated_curves, dtype=np.float32):
+    """Measures how far compact storage moves the Monte Carlo analytics away from the float64 run.
+    The bond is priced on the float64 simulated curves of the evaluation date and on the same curves rounded
+    to the storage dtype, with the compact analytics rounded again as they would be stored. Pricing itself
+    accumulates in float64 in both runs.
+    Args:
+        config: Configuration dictionary containing the bond and monte_carlo sections.
+        simulated_curves (pd.DataFrame): Float64 simulated yield curves indexed by (date, sim_id).
+        dtype (np.dtype): The compact storage dtype. Default is float32.
+    Returns:
+        pd.DataFrame: The maximum absolute deviation of each analytic, the same relative to its largest magnitude
+        across paths, and the cube size in bytes for float64 and the storage dtype.
+    """
+    bond = config["bond"]
+    date = pd.to_datetime(config["monte_carlo"]["evaluation"])
+    settlement_date = max(pd.to_datetime(bond["settlement_date"]), date)
+    bond_args = (settlement_date, pd.to_datetime(bond["maturity_date"]), bond["coupon_rate"], bond["frequency"], bond["face_value"], bond["business_day_convention"], bond["day_count_convention"])
+
+    sim_index = build_sim_curve_index(*simulated_curves_to_cube(simulated_curves))
+    curve_date, curves = sim_curves_on_date(sim_index, date)
+    reference = price_sim_curves(curves, sim_index["tenors"], curve_date, bond_args, config["monte_carlo"]["shock_size_bp"])
+    compact = price_sim_curves(curves.astype(dtype), sim_index["tenors"], curve_date, bond_args, config["monte_carlo"]["shock_size_bp"])
+
+    rows = []
+    for metric, ref in reference.items():
+        deviation = np.abs(compact[metric].astype(dtype).astype(float) - ref)
+        # Relative to the largest magnitude across paths, so near-zero KRDs do not dominate
+        scale = np.abs(ref).max()
+        rows.append({
+            "metric": metric,
+            "max_abs_deviation": deviation.max(),
+            "max_rel_deviation": deviation.max() / scale if scale > 0 else 0.0,
+        })
+    report_df = pd.DataFrame(rows)
+    report_df["storage_dtype"] = np.dtype(dtype).name
+    report_df["cube_bytes_float64"] = sim_index["cube"].astype(float).nbytes
+    report_df["cube_bytes_storage"] = sim_index["cube"].astype(dtype).nbytes
+    return report_df
 
 def save_simulated_analytics(config, analytics_df):
     """Saves the simulated yield curves to CSV file.
+    Float columns are stored in the configured storage dtype.
     Args:
         config: Configuration dictionary containing paths.
         analytics_df (pd.DataFrame): DataFrame containing the simulated yield curve analytics.
     """
     processed_dir = config["data_directory"]["reports"]
     os.makedirs(processed_dir, exist_ok=True)
-    analytics_df.to_csv(os.path.join(processed_dir, "simulated_yield_curve_analytics.csv"), index=False)
+    float_columns = analytics_df.select_dtypes("float").columns
+    analytics_df = analytics_df.astype({col: storage_dtype(config) for col in float_columns})
+    analytics_df.to_csv(os.path.join(processed_dir, "simulated_yield_curve_analytics.csv"), index=False, float_format=storage_float_format(config))
+
+def save_precision_report(config, report_df):
+    """Saves the storage precision comparison to CSV file.
+    Args:
+        config: Configuration dictionary containing paths.
+        report_df (pd.DataFrame): DataFrame containing the deviation of each analytic under compact storage.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    report_df.to_csv(os.path.join(reports_dir, "storage_precision_report.csv"), index=False)
+
+def save_delta_gamma_prices(config, revaluation_df):
+    """Saves the delta-gamma revaluation results to CSV file.
+    Args:
+        config: Configuration dictionary containing paths.
+        revaluation_df (pd.DataFrame): DataFrame containing the price of each path and its approximation flag.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    revaluation_df.to_csv(os.path.join(reports_dir, "simulated_delta_gamma_prices.csv"), index=False)
+
+def save_krd_gamma(config, gamma_df):
+    """Saves the simulated key rate gamma matrices to CSV file.
+    Args:
+        config: Configuration dictionary containing paths.
+        gamma_df (pd.DataFrame): DataFrame containing the flattened gamma matrix of each simulation path.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    gamma_df.to_csv(os.path.join(reports_dir, "simulated_krd_gamma.csv"), index=False)
     
 if __name__ == "__main__":
     main()
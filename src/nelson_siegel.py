@@ -0,0 +1,287 @@
+import pandas as pd
+import numpy as np
+import os
+from config_loader import load_config
+from bond_analytics import tenor_to_years
+from rate_simulation import read_processed_data
+from shared_cube import load_simulated_cube
+
+NS_PARAMS = ["beta0", "beta1", "beta2", "tau1"]
+NSS_PARAMS = ["beta0", "beta1", "beta2", "beta3", "tau1", "tau2"]
+
+def main():
+    """Main function to fit Nelson-Siegel(-Svensson) curves to the historical and simulated yield curves."""
+    config = load_config()
+    ns_config = config["nelson_siegel"]
+    model = ns_config["model"]
+
+    historical = read_processed_data(config)
+    params = fit_curve_frame(historical, config)
+    save_nss_params(params, config["data_directory"]["processed"], "nss_params.csv")
+    print(f"Fitted {model.upper()} curves to {len(params)} historical dates. Mean RMSE: {params['rmse'].mean():.6f}")
+
+    sim_curves_path = os.path.join(config["data_directory"]["simulations"], "simulated_yield_curves.csv")
+    if os.path.exists(sim_curves_path):
+        dates, sim_ids, tenors, cube = load_simulated_cube(config)
+        fitted, rmse = fit_nss_batch(cube, [tenor_to_years(t) for t in tenors], **fit_kwargs(ns_config))
+        sim_params = params_to_frame(fitted, rmse, model, dates, sim_ids)
+        save_nss_params(sim_params, config["data_directory"]["simulations"], "simulated_nss_params.csv")
+        print(f"Fitted {model.upper()} curves to {len(sim_params)} simulated curves. Mean RMSE: {sim_params['rmse'].mean():.6f}")
+
+def fit_kwargs(ns_config):
+    """Builds the keyword arguments for fit_nss_batch from the nelson_siegel config section.
+    Args:
+        ns_config (dict): The nelson_siegel section of the configuration.
+    Returns:
+        dict: Keyword arguments for fit_nss_batch.
+    """
+    return {
+        "model": ns_config["model"],
+        "tau1_grid": np.geomspace(*ns_config["tau1_grid"][:2], int(ns_config["tau1_grid"][2])),
+        "tau2_grid": np.geomspace(*ns_config["tau2_grid"][:2], int(ns_config["tau2_grid"][2])),
+        "warm_start_radius": ns_config["warm_start_radius"],
+        "reseed_every": ns_config.get("warm_start_reseed_days", 21),
+        "sse_tolerance": ns_config.get("warm_start_sse_tolerance", 0.25),
+    }
+
+def nss_factor_loadings(t, tau1, tau2=None):
+    """Computes the Nelson-Siegel(-Svensson) factor loadings for the given maturities and decay parameters.
+    Args:
+        t (np.ndarray): Maturities in years, broadcastable against tau1 and tau2.
+        tau1 (np.ndarray): First decay parameter in years.
+        tau2 (np.ndarray): Second decay parameter in years. None gives the 3-factor Nelson-Siegel loadings.
+    Returns:
+        np.ndarray: Array of loadings with the factor dimension last (3 for NS, 4 for NSS).
+    """
+    def slope_curvature(x):
+        # Limit of (1 - e^-x) / x is 1 as x -> 0, which keeps t = 0 well defined
+        x_safe = np.where(x > 1e-8, x, 1.0)
+        slope = np.where(x > 1e-8, (1 - np.exp(-x_safe)) / x_safe, 1.0)
+        return slope, slope - np.exp(-x)
+
+    t = np.asarray(t, dtype=float)
+    slope, curvature = slope_curvature(t / tau1)
+    loadings = [np.ones_like(slope), slope, curvature]
+    if tau2 is not None:
+        loadings.append(slope_curvature(t / tau2)[1])
+    return np.stack(np.broadcast_arrays(*loadings), axis=-1)
+
+def nss_zero_yields(params, t, model="nss"):
+    """Evaluates fitted Nelson-Siegel(-Svensson) curves at arbitrary maturities.
+    Args:
+        params (np.ndarray): Parameter array of shape (..., n_params) as returned by fit_nss_batch.
+        t (np.ndarray): Maturities in years, broadcastable to (..., n_maturities).
+        model (str): "ns" or "nss".
+    Returns:
+        np.ndarray: Zero yields of shape (..., n_maturities), ready for bond_analytics.price_from_zero_yields.
+    """
+    params = np.asarray(params, dtype=float)
+    n_betas = 4 if model == "nss" else 3
+    betas = params[..., :n_betas]
+    tau1 = params[..., n_betas, None]
+    tau2 = params[..., n_betas + 1, None] if model == "nss" else None
+    loadings = nss_factor_loadings(t, tau1, tau2)
+    return np.einsum("...mp,...p->...m", loadings, betas)
+
+def build_decay_grid(tenor_years, model="nss", tau1_grid=None, tau2_grid=None):
+    """Precomputes the least-squares projection for every point of the fixed decay parameter grid.
+    Args:
+        tenor_years (array-like): Curve node maturities in years.
+        model (str): "ns" or "nss".
+        tau1_grid (np.ndarray): Grid of first decay parameters.
+        tau2_grid (np.ndarray): Grid of second decay parameters (NSS only).
+    Returns:
+        dict: Grid shape, decay values, design matrices, pseudo-inverses and a validity mask, all flattened over the grid.
+    """
+    tau1_grid = np.asarray(tau1_grid, dtype=float)
+    tau2_grid = np.asarray(tau2_grid if model == "nss" else [np.nan], dtype=float)
+    tau1, tau2 = [g.ravel() for g in np.meshgrid(tau1_grid, tau2_grid, indexing="ij")]
+    t = np.asarray(tenor_years, dtype=float)
+
+    if model == "nss":
+        X = nss_factor_loadings(t[None, :], tau1[:, None], tau2[:, None])
+        # Keep tau2 well above tau1 so the two curvature humps stay identifiable
+        valid = tau2 > tau1 * 1.5
+    elif model == "ns":
+        X = nss_factor_loadings(t[None, :], tau1[:, None])
+        valid = np.ones(tau1.shape, dtype=bool)
+    else:
+        raise ValueError("Unsupported model. Use 'ns' or 'nss'.")
+
+    # Stacked small least-squares systems, one per grid point
+    X_pinv = np.linalg.pinv(X)
+    return {
+        "shape": (len(tau1_grid), len(tau2_grid)),
+        "tau": np.column_stack([tau1, tau2]) if model == "nss" else tau1[:, None],
+        "X": X,
+        "X_pinv": X_pinv,
+        "valid": valid,
+    }
+
+def _fit_on_candidates(Y, grid, candidates):
+    """Fits each curve on a set of candidate grid points and keeps the best one.
+    Args:
+        Y (np.ndarray): Curves of shape (n_curves, n_tenors).
+        grid (dict): Output of build_decay_grid.
+        candidates (np.ndarray): Flat grid indices, either shared by all curves with shape (n_candidates,)
+            or per curve with shape (n_curves, n_candidates); -1 marks an unused slot.
+    Returns:
+        tuple: (best grid index, betas, sse) per curve.
+    """
+    idx = np.where(candidates >= 0, candidates, 0)
+    if idx.ndim == 1:
+        betas = np.einsum("cpk,nk->ncp", grid["X_pinv"][idx], Y)
+        fitted = np.einsum("ckp,ncp->nck", grid["X"][idx], betas)
+        idx = np.broadcast_to(idx, (len(Y), len(idx)))
+        candidates = np.broadcast_to(candidates, idx.shape)
+    else:
+        betas = np.einsum("ncpk,nk->ncp", grid["X_pinv"][idx], Y)
+        fitted = np.einsum("nckp,ncp->nck", grid["X"][idx], betas)
+    sse = ((Y[:, None, :] - fitted) ** 2).sum(axis=-1)
+    sse = np.where((candidates >= 0) & grid["valid"][idx], sse, np.inf)
+    best = sse.argmin(axis=1)
+    rows = np.arange(len(Y))
+    return idx[rows, best], betas[rows, best], sse[rows, best]
+
+def _neighbour_candidates(best, grid, radius):
+    """Lists the grid points within `radius` steps of each curve's previous best decay parameters.
+    Args:
+        best (np.ndarray): Flat grid indices of the previous fit, shape (n_curves,).
+        grid (dict): Output of build_decay_grid.
+        radius (int): Search radius in grid steps along each decay dimension.
+    Returns:
+        np.ndarray: Flat candidate indices of shape (n_curves, n_candidates) with -1 outside the grid.
+    """
+    n1, n2 = grid["shape"]
+    i1, i2 = np.unravel_index(best, grid["shape"])
+    steps = np.arange(-radius, radius + 1)
+    d1, d2 = [d.ravel() for d in np.meshgrid(steps, steps if n2 > 1 else [0], indexing="ij")]
+    c1 = i1[:, None] + d1[None, :]
+    c2 = i2[:, None] + d2[None, :]
+    inside = (c1 >= 0) & (c1 < n1) & (c2 >= 0) & (c2 < n2)
+    return np.where(inside, np.ravel_multi_index((np.clip(c1, 0, n1 - 1), np.clip(c2, 0, n2 - 1)), grid["shape"]), -1)
+
+def _on_neighbourhood_edge(best, previous, grid, radius):
+    """Flags fits whose decay parameters are `radius` grid steps from the previous best, unless that is the grid boundary.
+    Args:
+        best (np.ndarray): Flat grid indices of the warm start fit, shape (n_curves,).
+        previous (np.ndarray): Flat grid indices of the previous fit, shape (n_curves,).
+        grid (dict): Output of build_decay_grid.
+        radius (int): Search radius in grid steps along each decay dimension.
+    Returns:
+        np.ndarray: Boolean mask of shape (n_curves,).
+    """
+    edge = np.zeros(len(best), dtype=bool)
+    for i, p, n in zip(np.unravel_index(best, grid["shape"]), np.unravel_index(previous, grid["shape"]), grid["shape"]):
+        step = i - p
+        edge |= (np.abs(step) >= radius) & (i > 0) & (i < n - 1)
+    return edge
+
+def fit_nss_batch(yields, tenor_years, model="nss", tau1_grid=None, tau2_grid=None, warm_start_radius=2, reseed_every=21, sse_tolerance=0.25, chunk_size=512):
+    """Fits Nelson-Siegel(-Svensson) curves to a batch of yield curves over a fixed decay parameter grid.
+    The first date of every path is searched over the full grid; each later date only searches the grid points
+    around the previous date's decay parameters (warm start). A curve falls back to the full grid when its warm
+    start optimum lies on the edge of the neighbourhood (the true optimum may be further out) or its SSE is worse
+    than the previous date's by more than sse_tolerance, and every path is re-seeded from the full grid every
+    reseed_every dates so an off-optimum fit cannot drift along the path. A radius of None searches the full grid
+    every date.
+    Args:
+        yields (np.ndarray): Yield curves of shape (n_dates, n_tenors) or (n_dates, n_paths, n_tenors).
+        tenor_years (array-like): Curve node maturities in years.
+        model (str): "ns" or "nss".
+        tau1_grid (np.ndarray): Grid of first decay parameters. Defaults to 30 points between 0.25 and 10 years.
+        tau2_grid (np.ndarray): Grid of second decay parameters. Defaults to 25 points between 1 and 30 years.
+        warm_start_radius (int): Grid steps searched around the previous date's decay parameters.
+        reseed_every (int): Dates between full grid searches of every path. None never re-seeds.
+        sse_tolerance (float): Relative SSE increase over the previous date above which a curve is refitted on the full grid.
+        chunk_size (int): Number of curves fitted together in a full grid search.
+    Returns:
+        tuple: (params, rmse) with params of shape (..., n_params) and rmse of shape (...), matching the input batch dimensions.
+    """
+    tau1_grid = np.geomspace(0.25, 10.0, 30) if tau1_grid is None else tau1_grid
+    tau2_grid = np.geomspace(1.0, 30.0, 25) if tau2_grid is None else tau2_grid
+    grid = build_decay_grid(tenor_years, model, tau1_grid, tau2_grid)
+
+    yields = np.asarray(yields, dtype=float)
+    single_path = yields.ndim == 2
+    Y = yields[:, None, :] if single_path else yields
+    n_dates, n_paths, n_tenors = Y.shape
+    n_betas = grid["X"].shape[-1]
+
+    best_idx = np.zeros((n_dates, n_paths), dtype=int)
+    betas = np.zeros((n_dates, n_paths, n_betas))
+    sse = np.zeros((n_dates, n_paths))
+
+    full_grid = np.arange(len(grid["valid"]))[grid["valid"]]
+
+    def full_search(d, paths):
+        # Chunked so the (curves x grid x tenor) residuals stay small
+        for start in range(0, len(paths), chunk_size):
+            rows = paths[start:start + chunk_size]
+            best_idx[d, rows], betas[d, rows], sse[d, rows] = _fit_on_candidates(Y[d, rows], grid, full_grid)
+
+    all_paths = np.arange(n_paths)
+    for d in range(n_dates):
+        if d == 0 or warm_start_radius is None or (reseed_every and d % reseed_every == 0):
+            full_search(d, all_paths)
+            continue
+
+        candidates = _neighbour_candidates(best_idx[d - 1], grid, warm_start_radius)
+        best_idx[d], betas[d], sse[d] = _fit_on_candidates(Y[d], grid, candidates)
+        on_edge = _on_neighbourhood_edge(best_idx[d], best_idx[d - 1], grid, warm_start_radius)
+        worse = sse[d] > sse[d - 1] * (1 + sse_tolerance) + np.finfo(float).tiny
+        fallback = all_paths[on_edge | worse]
+        if len(fallback):
+            full_search(d, fallback)
+
+    params = np.concatenate([betas, grid["tau"][best_idx]], axis=-1)
+    rmse = np.sqrt(sse / n_tenors)
+    if single_path:
+        return params[:, 0], rmse[:, 0]
+    return params, rmse
+
+def fit_curve_frame(curves, config):
+    """Fits the configured Nelson-Siegel(-Svensson) model to a DataFrame of yield curves (one curve per row).
+    Args:
+        curves (pd.DataFrame): DataFrame indexed by date with tenor columns.
+        config: Configuration dictionary containing the nelson_siegel section.
+    Returns:
+        pd.DataFrame: DataFrame of fitted parameters and RMSE indexed by date.
+    """
+    ns_config = config["nelson_siegel"]
+    tenor_years = [tenor_to_years(t) for t in curves.columns]
+    params, rmse = fit_nss_batch(curves.to_numpy(dtype=float), tenor_years, **fit_kwargs(ns_config))
+    return params_to_frame(params, rmse, ns_config["model"], curves.index)
+
+def params_to_frame(params, rmse, model, dates, sim_ids=None):
+    """Converts fitted parameter arrays into a DataFrame.
+    Args:
+        params (np.ndarray): Parameters of shape (n_dates, n_params) or (n_dates, n_paths, n_params).
+        rmse (np.ndarray): Fit RMSE matching the batch dimensions of params.
+        model (str): "ns" or "nss".
+        dates (pd.Index): Curve dates.
+        sim_ids (pd.Index): Simulation path ids, if params has a path dimension.
+    Returns:
+        pd.DataFrame: DataFrame of parameters indexed by date (and sim_id).
+    """
+    columns = NSS_PARAMS if model == "nss" else NS_PARAMS
+    if sim_ids is None:
+        index = pd.Index(dates, name="date")
+    else:
+        index = pd.MultiIndex.from_product([dates, sim_ids], names=["date", "sim_id"])
+    frame = pd.DataFrame(params.reshape(-1, len(columns)), index=index, columns=columns)
+    frame["rmse"] = rmse.reshape(-1)
+    return frame
+
+def save_nss_params(params, directory, filename):
+    """Saves fitted curve parameters to a CSV file.
+    Args:
+        params (pd.DataFrame): DataFrame of fitted parameters.
+        directory (str): Directory to save into.
+        filename (str): Name of the CSV file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    params.to_csv(os.path.join(directory, filename), index=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+import os
+from config_loader import load_config
+from bond_analytics import generate_cashflows, year_fractions, batch_price_duration_convexity
+from key_rate_duration import compute_node_sensitivities
+from shared_cube import resolve_sim_date_position, load_simulated_cube, load_simulated_factor_cube
+from rate_simulation import read_processed_data, read_pca_results
+
+def main():
+    """Main function to attribute the horizon P&L of every simulated path to the PCA factors."""
+    config = load_config()
+    processed_data = read_processed_data(config)
+    loadings = read_pca_results(config)["loadings"]
+
+    dates, sim_ids, curve_tenors, cube = load_simulated_cube(config)
+    horizon_date, horizon_pos = resolve_sim_date_position(dates, pd.to_datetime(config["monte_carlo"]["evaluation"]))
+
+    factor_paths = load_simulated_factor_cube(config)
+    if factor_paths is not None:
+        cumulative_factors = factor_paths[1][:horizon_pos + 1].sum(axis=0, dtype=float)
+    else:
+        print("Simulated factor paths not found, projecting the curve changes onto the loadings instead.")
+        cumulative_factors = None
+
+    attribution_df = attribute_pnl(
+        processed_data[curve_tenors].iloc[[-1]],
+        cube[horizon_pos],
+        curve_tenors,
+        horizon_date,
+        loadings.loc[curve_tenors],
+        config,
+        cumulative_factors,
+    )
+    attribution_df.insert(0, "sim_id", sim_ids)
+    attribution_df.insert(0, "date", horizon_date)
+
+    save_pnl_attribution(config, attribution_df)
+    print(f"P&L attribution computed for {len(attribution_df)} paths on {horizon_date.date()}.")
+
+def _bond_schedule(settlement_date, curve_date, bond):
+    """Builds the cashflow times and amounts of the configured bond for a settlement and curve date."""
+    cash_flows_df = generate_cashflows(settlement_date, pd.to_datetime(bond["maturity_date"]), bond["coupon_rate"], bond["frequency"], bond["face_value"], bond["business_day_convention"])
+    t = year_fractions(curve_date, cash_flows_df["date"].to_numpy(dtype="datetime64[D]"), bond["day_count_convention"])
+    return cash_flows_df, t, cash_flows_df["cashflow_amount"].to_numpy(dtype=float)
+
+def attribute_pnl(base_curve, horizon_curves, curve_tenors, horizon_date, loadings, config, cumulative_factors=None):
+    """Breaks down the horizon P&L of every path into carry/roll-down, per-factor and residual parts.
+    Total P&L is the path price at the horizon plus coupons received since the base date, minus the price on
+    the base curve at the base date. Carry/roll-down is the same quantity with the base curve left unchanged.
+    The curve change of each path is split along the PCA loadings using the cumulative simulated factor
+    changes, and each factor is charged its delta plus its share of the gamma term, g.dY_i + 0.5 dY_i' H dY,
+    with g and H the node sensitivities of the rolled-down base curve. The residual collects the curve change
+    outside the factors and the higher-order terms.
+    Args:
+        base_curve (pd.DataFrame): Single-row DataFrame with the curve the simulation started from, indexed by date.
+        horizon_curves (np.ndarray): Simulated curves at the horizon date, shape (n_paths, n_tenors).
+        curve_tenors (list of str): Tenor labels matching the curve columns.
+        horizon_date (pd.Timestamp): The horizon (evaluation) date.
+        loadings (pd.DataFrame): PCA loadings indexed by tenor in curve_tenors order.
+        config: Configuration dictionary containing the bond section.
+        cumulative_factors (np.ndarray): Cumulative simulated factor changes to the horizon, shape (n_paths, n_factors).
+            If None, the curve changes are projected onto the loadings.
+    Returns:
+        pd.DataFrame: A DataFrame with the total, carry/roll-down, per-factor and residual P&L of each path.
+    """
+    bond = config["bond"]
+    base_date = pd.Timestamp(base_curve.index[0])
+    horizon_date = pd.Timestamp(horizon_date)
+    base = base_curve.to_numpy(dtype=float)[0]
+    L = loadings.to_numpy(dtype=float)
+
+    bond_settlement = pd.to_datetime(bond["settlement_date"])
+    start_settlement = max(bond_settlement, base_date)
+    horizon_settlement = max(bond_settlement, horizon_date)
+
+    start_cf_df, start_t, start_cf = _bond_schedule(start_settlement, base_date, bond)
+    start_price = batch_price_duration_convexity(base[None, :], curve_tenors, start_t, start_cf, bond["frequency"])["price"][0]
+    paid = (start_cf_df["date"] > start_settlement) & (start_cf_df["date"] <= horizon_settlement)
+    coupons_received = start_cf_df.loc[paid, "cashflow_amount"].sum()
+
+    _, t, cf = _bond_schedule(horizon_settlement, horizon_date, bond)
+    horizon_price = batch_price_duration_convexity(horizon_curves, curve_tenors, t, cf, bond["frequency"])["price"]
+    sens = compute_node_sensitivities(base, curve_tenors, t, cf)
+
+    total_pnl = horizon_price + coupons_received - start_price
+    carry = sens["price"] + coupons_received - start_price
+
+    shifts = horizon_curves - base[None, :]
+    if cumulative_factors is None:
+        cumulative_factors = shifts @ L @ np.linalg.pinv(L.T @ L)
+    # Curve change along each factor: (paths x factors x tenors)
+    factor_shifts = cumulative_factors[:, :, None] * L.T[None, :, :]
+    gamma_share = 0.5 * factor_shifts @ (sens["hessian"] @ shifts[:, :, None])
+    factor_pnl = factor_shifts @ sens["gradient"] + gamma_share[..., 0]
+
+    attribution_df = pd.DataFrame({
+        "total_pnl": total_pnl,
+        "carry_rolldown": carry,
+    })
+    for i, pc in enumerate(loadings.columns):
+        attribution_df[f"pnl_{pc}"] = factor_pnl[:, i]
+    attribution_df["residual"] = total_pnl - carry - factor_pnl.sum(axis=1)
+    return attribution_df
+
+def save_pnl_attribution(config, attribution_df):
+    """Saves the P&L attribution to CSV file.
+    Args:
+        config: Configuration dictionary containing paths.
+        attribution_df (pd.DataFrame): DataFrame containing the P&L breakdown of each path.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    attribution_df.to_csv(os.path.join(reports_dir, "pnl_attribution.csv"), index=False)
+
+if __name__ == "__main__":
+    main()
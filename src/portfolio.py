@@ -0,0 +1,290 @@
+import pandas as pd
+import numpy as np
+import os
+from scipy import sparse
+from config_loader import load_config
+from rate_simulation import read_processed_data
+from bond_analytics import generate_cashflow_dates, year_fractions, interpolation_weights, sort_curve_nodes
+from key_rate_duration import KEY_RATE_TENORS
+from shared_cube import load_sim_curve_index, sim_curves_on_date
+
+POSITION_COLUMNS = ["position_id", "maturity_date", "coupon_rate", "notional"]
+
+def main():
+    """Main function to compute Monte Carlo analytics for every position in the portfolio."""
+    config = load_config()
+    date = pd.to_datetime(config["monte_carlo"]["evaluation"])
+    positions = load_positions(config["portfolio"]["positions_file"], config)
+
+    sim_index = load_sim_curve_index(config)
+    sim_ids = sim_index["sim_ids"]
+    curve_date, curves = sim_curves_on_date(sim_index, date)
+
+    position_df, aggregate_df = compute_portfolio_analytics(
+        positions,
+        curves,
+        sim_index["tenors"],
+        curve_date,
+        date,
+        config["bond"]["day_count_convention"],
+        config["monte_carlo"]["shock_size_bp"],
+    )
+    aggregate_df.insert(0, "sim_id", sim_ids)
+    aggregate_df.insert(0, "date", curve_date)
+
+    base_curve = read_processed_data(config)[sim_index["tenors"]].iloc[[-1]]
+    path_pnl_df, position_pnl_df = compute_portfolio_pnl(
+        positions,
+        base_curve,
+        curves,
+        sim_index["tenors"],
+        curve_date,
+        date,
+        config["bond"]["day_count_convention"],
+    )
+    path_pnl_df.insert(0, "sim_id", sim_ids)
+    path_pnl_df.insert(0, "date", curve_date)
+    position_pnl_df.insert(0, "sim_id", np.tile(sim_ids, len(position_pnl_df) // len(sim_ids)))
+    position_pnl_df.insert(0, "date", curve_date)
+
+    save_portfolio_analytics(config, position_df, aggregate_df)
+    save_portfolio_pnl(config, path_pnl_df, position_pnl_df)
+    print(f"Portfolio analytics computed for {len(position_df)} positions across {len(sim_ids)} paths.")
+
+def load_positions(path, config):
+    """Loads a position file (CSV or Parquet) of bond terms and notionals.
+    Required columns are position_id, maturity_date, coupon_rate and notional. Optional settlement_date,
+    frequency, face_value and business_day_convention columns default to the config bond section.
+    Args:
+        path (str): Path to the position file.
+        config: Configuration dictionary containing the default bond parameters.
+    Returns:
+        pd.DataFrame: DataFrame of positions with every bond parameter filled in.
+    """
+    if path.endswith(".parquet"):
+        positions = pd.read_parquet(path)
+    else:
+        positions = pd.read_csv(path)
+    missing = [col for col in POSITION_COLUMNS if col not in positions.columns]
+    if missing:
+        raise ValueError(f"Position file is missing required columns: {missing}")
+
+    defaults = {
+        "settlement_date": config["bond"]["settlement_date"],
+        "frequency": config["bond"]["frequency"],
+        "face_value": config["bond"]["face_value"],
+        "business_day_convention": config["bond"]["business_day_convention"],
+    }
+    for col, value in defaults.items():
+        positions[col] = positions[col].fillna(value) if col in positions.columns else value
+    positions["settlement_date"] = pd.to_datetime(positions["settlement_date"])
+    positions["maturity_date"] = pd.to_datetime(positions["maturity_date"])
+    return positions
+
+def build_cashflow_matrix(positions, date):
+    """Maps the cashflows of every position onto a shared sorted date grid.
+    Args:
+        positions (pd.DataFrame): DataFrame of positions as returned by load_positions.
+        date (pd.Timestamp): The evaluation date; positions settle on the later of this and their settlement date.
+    Returns:
+        tuple: (grid_dates, cashflow_matrix, positions) where cashflow_matrix is a sparse (n_positions x n_grid_dates)
+        matrix of cashflow amounts and positions excludes positions with no cashflows left.
+    """
+    settlement = positions["settlement_date"].where(positions["settlement_date"] > date, date)
+    live = positions["maturity_date"] > settlement
+    if not live.all():
+        print(f"Skipping {(~live).sum()} positions that mature on or before settlement.")
+    positions = positions[live].reset_index(drop=True)
+    settlement = settlement[live].reset_index(drop=True)
+
+    # Schedule dates only depend on these terms; amounts are scaled per position afterwards
+    schedule_keys = ["settlement", "maturity_date", "frequency", "business_day_convention"]
+    terms = positions.assign(settlement=settlement)
+    schedules = {}
+    for key in terms[schedule_keys].drop_duplicates().itertuples(index=False):
+        dates = generate_cashflow_dates(key.settlement, key.maturity_date, int(key.frequency), key.business_day_convention)
+        schedules[tuple(key)] = np.array(dates, dtype="datetime64[D]")
+
+    rows, dates, amounts = [], [], []
+    for i, position in enumerate(terms.itertuples(index=False)):
+        schedule = schedules[tuple(getattr(position, k) for k in schedule_keys)]
+        coupon = position.coupon_rate / position.frequency * position.face_value
+        cashflows = np.full(len(schedule), coupon)
+        cashflows[-1] += position.face_value
+        rows.append(np.full(len(schedule), i))
+        dates.append(schedule)
+        amounts.append(cashflows)
+
+    grid_dates, grid_idx = np.unique(np.concatenate(dates), return_inverse=True)
+    cashflow_matrix = sparse.csr_matrix(
+        (np.concatenate(amounts), (np.concatenate(rows), grid_idx)),
+        shape=(len(positions), len(grid_dates)),
+    )
+    return grid_dates, cashflow_matrix, positions
+
+def discount_factors(curves, curve_tenors, curve_date, grid_dates, day_count_convention="ACT/365"):
+    """Computes the discount factor of every curve at every grid date, interpolating the zero yields once.
+    Args:
+        curves (np.ndarray): Curve node yields of shape (n_paths, n_tenors).
+        curve_tenors (list of str): Tenor labels matching the last axis of curves.
+        curve_date (pd.Timestamp): The date of the curves, used as the origin of the discounting year fractions.
+        grid_dates (np.ndarray): Sorted cashflow dates.
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+    Returns:
+        tuple: (DF, y, t, weights) with discount factors and zero yields of shape (n_paths, n_grid_dates), the year
+        fractions and the interpolation weights in sorted tenor order.
+    """
+    order, tenor_years = sort_curve_nodes(curve_tenors)
+    t = year_fractions(pd.Timestamp(curve_date), grid_dates, day_count_convention)
+    weights = interpolation_weights(t, tenor_years)
+    y = np.asarray(curves, dtype=float)[:, order] @ weights.T
+    return np.exp(-y * t), y, t, weights
+
+def compute_portfolio_pnl(positions, base_curve, curves, curve_tenors, curve_date, date, day_count_convention="ACT/365"):
+    """Computes the P&L of every position on every simulated path from the base curve to the evaluation date.
+    As in pnl_attribution, P&L is the value on the path at the evaluation date plus the cashflows received since
+    the base date, minus the value on the base curve at the base date. Values are market values (price per face
+    x notional / face), so they add up across positions.
+    Args:
+        positions (pd.DataFrame): DataFrame of positions as returned by load_positions.
+        base_curve (pd.DataFrame): Single-row DataFrame with the curve the simulation started from, indexed by date.
+        curves (np.ndarray): Simulated curve node yields at the evaluation date, shape (n_paths, n_tenors).
+        curve_tenors (list of str): Tenor labels matching the last axis of curves and the base_curve columns.
+        curve_date (pd.Timestamp): The date of the simulated curves.
+        date (pd.Timestamp): The evaluation date.
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+    Returns:
+        tuple: (path_pnl_df, position_pnl_df) with the portfolio totals of each path, and one row per
+        (position, path) ordered position by position.
+    """
+    base_date = pd.Timestamp(base_curve.index[0])
+    grid_dates, C, positions = build_cashflow_matrix(positions, base_date)
+
+    # Cashflows paid on or before each position's settlement at the evaluation date are received, the rest are held
+    horizon_settlement = positions["settlement_date"].where(positions["settlement_date"] > pd.Timestamp(date), pd.Timestamp(date))
+    row_of_entry = np.repeat(np.arange(C.shape[0]), np.diff(C.indptr))
+    received = grid_dates[C.indices] <= horizon_settlement.to_numpy(dtype="datetime64[D]")[row_of_entry]
+    C_received = sparse.csr_matrix((np.where(received, C.data, 0.0), C.indices, C.indptr), shape=C.shape)
+    C_held = sparse.csr_matrix((np.where(received, 0.0, C.data), C.indices, C.indptr), shape=C.shape)
+
+    base_df = discount_factors(base_curve[curve_tenors].to_numpy(dtype=float), curve_tenors, base_date, grid_dates, day_count_convention)[0]
+    path_df = discount_factors(curves, curve_tenors, curve_date, grid_dates, day_count_convention)[0]
+
+    units = (positions["notional"] / positions["face_value"]).to_numpy(dtype=float)
+    base_value = (C @ base_df.T)[:, 0] * units
+    cash_received = np.asarray(C_received.sum(axis=1)).ravel() * units
+    market_value = (C_held @ path_df.T).T * units
+    pnl = market_value + cash_received - base_value
+
+    path_pnl_df = pd.DataFrame({
+        "base_value": base_value.sum(),
+        "market_value": market_value.sum(axis=1),
+        "cash_received": cash_received.sum(),
+        "pnl": pnl.sum(axis=1),
+    })
+    n_paths = len(market_value)
+    position_pnl_df = pd.DataFrame({
+        "position_id": np.repeat(positions["position_id"].to_numpy(), n_paths),
+        "base_value": np.repeat(base_value, n_paths),
+        "market_value": market_value.T.ravel(),
+        "cash_received": np.repeat(cash_received, n_paths),
+        "pnl": pnl.T.ravel(),
+    })
+    return path_pnl_df, position_pnl_df
+
+def compute_portfolio_analytics(positions, curves, curve_tenors, curve_date, date, day_count_convention="ACT/365", shock_size_bp=1.0, tenors=KEY_RATE_TENORS):
+    """Computes per-position and aggregated price, duration, convexity and KRDs across simulated curves.
+    Discount factors are computed once per (path, grid date) and every position is priced with a sparse
+    cashflow matrix x discount matrix product, so no curve is repriced per position.
+    Args:
+        positions (pd.DataFrame): DataFrame of positions as returned by load_positions.
+        curves (np.ndarray): Curve node yields of shape (n_paths, n_tenors).
+        curve_tenors (list of str): Tenor labels matching the last axis of curves.
+        curve_date (pd.Timestamp): The date of the curves, used as the origin of the discounting year fractions.
+        date (pd.Timestamp): The evaluation date.
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+        shock_size_bp (float): The size of the shock in basis points for the KRDs. Default is 1.0.
+        tenors (list of str): Tenors to compute key rate durations for.
+    Returns:
+        tuple: (position_df, aggregate_df) with per-position statistics across paths and per-path portfolio totals.
+    """
+    missing = [tenor for tenor in tenors if tenor not in curve_tenors]
+    if missing:
+        raise ValueError(f"Tenors {missing} not found in the yield curve.")
+
+    grid_dates, C, positions = build_cashflow_matrix(positions, pd.Timestamp(date))
+    indicator = C.copy()
+    indicator.data[:] = 1.0
+
+    order, _ = sort_curve_nodes(curve_tenors)
+    sorted_tenors = [curve_tenors[i] for i in order]
+    DF, y, t, weights = discount_factors(curves, curve_tenors, curve_date, grid_dates, day_count_convention)
+
+    # (positions x grid) @ (grid x paths), transposed to (paths x positions)
+    price = (C @ DF.T).T
+    macaulay_duration = (C @ (DF * t).T).T / price
+    convexity = (C @ (DF * t**2).T).T / price
+    y_eff = (indicator @ (DF * y).T).T / (indicator @ DF.T).T
+    modified_duration = macaulay_duration / (1 + y_eff / positions["frequency"].to_numpy(dtype=float))
+
+    shock = shock_size_bp / 10000.0
+    krd = {}
+    for tenor in tenors:
+        bump = np.exp(-shock * weights[:, sorted_tenors.index(tenor)] * t)
+        P_plus = (C @ (DF * bump).T).T
+        P_minus = (C @ (DF / bump).T).T
+        krd[tenor] = (P_minus - P_plus) / (2 * shock * price)
+
+    # Position market value = price per face x notional / face
+    units = (positions["notional"] / positions["face_value"]).to_numpy(dtype=float)
+    value = price * units
+    total_value = value.sum(axis=1)
+    value_weights = value / total_value[:, None]
+
+    position_df = pd.DataFrame({
+        "position_id": positions["position_id"],
+        "notional": positions["notional"],
+        "price_mean": price.mean(axis=0),
+        "price_std": price.std(axis=0),
+        "price_p05": np.percentile(price, 5, axis=0),
+        "price_p95": np.percentile(price, 95, axis=0),
+        "modified_duration_mean": modified_duration.mean(axis=0),
+        "convexity_mean": convexity.mean(axis=0),
+    })
+    aggregate_df = pd.DataFrame({
+        "market_value": total_value,
+        "modified_duration": (value_weights * modified_duration).sum(axis=1),
+        "convexity": (value_weights * convexity).sum(axis=1),
+    })
+    for tenor in tenors:
+        position_df[f"krd_{tenor}_mean"] = krd[tenor].mean(axis=0)
+        aggregate_df[f"krd_{tenor}"] = (value_weights * krd[tenor]).sum(axis=1)
+
+    return position_df, aggregate_df
+
+def save_portfolio_analytics(config, position_df, aggregate_df):
+    """Saves the per-position and aggregated portfolio analytics to CSV files.
+    Args:
+        config: Configuration dictionary containing paths.
+        position_df (pd.DataFrame): DataFrame containing per-position statistics across paths.
+        aggregate_df (pd.DataFrame): DataFrame containing the portfolio totals for each path.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    position_df.to_csv(os.path.join(reports_dir, "portfolio_position_analytics.csv"), index=False)
+    aggregate_df.to_csv(os.path.join(reports_dir, "portfolio_aggregate_analytics.csv"), index=False)
+
+def save_portfolio_pnl(config, path_pnl_df, position_pnl_df):
+    """Saves the per-path portfolio P&L and the per-position, per-path P&L to CSV files.
+    Args:
+        config: Configuration dictionary containing paths.
+        path_pnl_df (pd.DataFrame): DataFrame containing the portfolio P&L of each path.
+        position_pnl_df (pd.DataFrame): DataFrame containing the P&L of each position on each path.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    path_pnl_df.to_csv(os.path.join(reports_dir, "portfolio_path_pnl.csv"), index=False)
+    position_pnl_df.to_csv(os.path.join(reports_dir, "portfolio_position_pnl.csv"), index=False)
+
+if __name__ == "__main__":
+    main()
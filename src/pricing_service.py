@@ -0,0 +1,432 @@
+import pandas as pd
+import numpy as np
+import os
+import json
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from functools import lru_cache
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from config_loader import load_config
+from bond_analytics import generate_cashflow_dates, year_fractions, batch_price_duration_convexity
+from key_rate_duration import compute_krd_batch, KEY_RATE_TENORS
+from rate_simulation import read_processed_data
+
+def main():
+    """Main function to run the local pricing service until interrupted."""
+    config = load_config()
+    service = create_service(config)
+    server = serve(service, config["pricing_service"]["host"], config["pricing_service"]["port"])
+    host, port = server.server_address[:2]
+    print(f"Pricing service listening on http://{host}:{port} (curve date {service['curve_date'].date()}). Press Ctrl-C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_service(service, server)
+        print("Pricing service stopped.")
+
+def create_service(config):
+    """Loads the latest curve (and optionally the simulated cube) and starts the micro-batching thread.
+    Args:
+        config: Configuration dictionary containing paths, the bond defaults and the pricing_service section.
+    Returns:
+        dict: The service state shared by the request handlers and the batching thread.
+    """
+    service_config = config["pricing_service"]
+    service = {
+        "config": config,
+        "curves_path": os.path.join(config["data_directory"]["processed"], "cleaned_data.csv"),
+        "requests": queue.Queue(),
+        "max_batch_size": service_config.get("max_batch_size", 256),
+        "max_wait": service_config.get("max_wait_ms", 2.0) / 1000.0,
+        "latencies": {},
+        "batch_sizes": deque(maxlen=service_config.get("latency_window", 10000)),
+        "latency_window": service_config.get("latency_window", 10000),
+        # Guards the latest curve, the latency windows and the batch sizes across handler threads and the batcher
+        "lock": threading.Lock(),
+        "started": time.time(),
+        "sim_index": None,
+        "stop": threading.Event(),
+    }
+    refresh_latest_curve(service, force=True)
+
+    if service_config.get("load_simulated_cube", False):
+        # Imported here so the service does not need simulations unless asked to serve them
+        from shared_cube import load_sim_curve_index
+        service["sim_index"] = load_sim_curve_index(config)
+
+    service["batcher"] = threading.Thread(target=_batch_loop, args=(service,), daemon=True)
+    service["batcher"].start()
+    return service
+
+def stop_service(service, server=None):
+    """Stops the HTTP server (if given) and the batching thread.
+    Args:
+        service (dict): The service state returned by create_service.
+        server (ThreadingHTTPServer): The server returned by serve.
+    """
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    service["stop"].set()
+    service["batcher"].join()
+
+def refresh_latest_curve(service, force=False, min_interval=1.0):
+    """Reloads the last row of cleaned_data.csv when the file has changed since it was loaded.
+    Runs under the service lock, since request handler threads call it concurrently with each other and the batcher.
+    Args:
+        service (dict): The service state returned by create_service.
+        force (bool): Reload regardless of the file modification time.
+        min_interval (float): Minimum number of seconds between modification time checks.
+    """
+    with service["lock"]:
+        now = time.time()
+        if not force and now - service.get("curve_checked", 0.0) < min_interval:
+            return
+        service["curve_checked"] = now
+        mtime = os.path.getmtime(service["curves_path"])
+        if not force and mtime == service.get("curve_mtime"):
+            return
+        latest = read_processed_data(service["config"]).iloc[-1]
+        # Swapped together so a request never sees a curve and date from different loads
+        service["latest"] = (pd.Timestamp(latest.name), list(latest.index), latest.to_numpy(dtype=float))
+        service["curve_mtime"] = mtime
+        service["curve_date"], service["tenors"], _ = service["latest"]
+
+@lru_cache(maxsize=4096)
+def cached_schedule(settlement_date, maturity_date, frequency, business_day_convention):
+    """Returns the cashflow dates of a bond, cached across requests.
+    Args:
+        settlement_date (pd.Timestamp): The settlement date of the bond.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        frequency (int): Number of coupon payments per year.
+        business_day_convention (str): The business day convention to use.
+    Returns:
+        np.ndarray: Read-only array of datetime64[D] cashflow dates.
+    """
+    dates = np.array(generate_cashflow_dates(settlement_date, maturity_date, frequency, business_day_convention), dtype="datetime64[D]")
+    dates.flags.writeable = False
+    return dates
+
+@lru_cache(maxsize=16384)
+def cached_year_fractions(curve_date, settlement_date, maturity_date, frequency, business_day_convention, day_count_convention):
+    """Returns the year fractions from the curve date to each cashflow of a bond, cached across requests.
+    Args:
+        curve_date (pd.Timestamp): The date of the pricing curve.
+        settlement_date (pd.Timestamp): The settlement date of the bond.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        frequency (int): Number of coupon payments per year.
+        business_day_convention (str): The business day convention to use.
+        day_count_convention (str): The day count convention to use.
+    Returns:
+        np.ndarray: Read-only array of year fractions.
+    """
+    t = year_fractions(curve_date, cached_schedule(settlement_date, maturity_date, frequency, business_day_convention), day_count_convention)
+    t.flags.writeable = False
+    return t
+
+def build_job(service, kind, payload):
+    """Validates a request and resolves its curve, cashflow times and amounts.
+    Everything that can fail is done here, in the request thread, so a bad request never breaks a batch.
+    Args:
+        service (dict): The service state returned by create_service.
+        kind (str): "price" or "krd".
+        payload (dict): The request body. maturity_date and coupon_rate are required; settlement_date, frequency,
+            face_value, business_day_convention and day_count_convention default to the config bond section.
+            The curve is the latest cleaned curve unless "curve" ({tenor: yield}) or "date" and "sim_id"
+            (a simulated path, if the cube is loaded) are given. KRD requests also accept tenors and shock_size_bp.
+    Returns:
+        dict: The job with its curve vector, cashflow times and amounts.
+    """
+    bond = service["config"]["bond"]
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object.")
+    if "maturity_date" not in payload or "coupon_rate" not in payload:
+        raise ValueError("maturity_date and coupon_rate are required.")
+
+    curve_date, tenors, curve = resolve_curve(service, payload)
+    settlement_date = max(pd.Timestamp(payload.get("settlement_date", bond["settlement_date"])), curve_date)
+    maturity_date = pd.Timestamp(payload["maturity_date"])
+    if maturity_date <= settlement_date:
+        raise ValueError(f"maturity_date {maturity_date.date()} is not after settlement {settlement_date.date()}.")
+    frequency = int(payload.get("frequency", bond["frequency"]))
+    if frequency not in (1, 2, 4, 12):
+        raise ValueError(f"Unsupported frequency: {frequency}.")
+    face_value = float(payload.get("face_value", bond["face_value"]))
+    coupon_rate = float(payload["coupon_rate"])
+
+    t = cached_year_fractions(
+        curve_date,
+        settlement_date,
+        maturity_date,
+        frequency,
+        payload.get("business_day_convention", bond["business_day_convention"]),
+        payload.get("day_count_convention", bond["day_count_convention"]),
+    )
+    cf = np.full(len(t), coupon_rate / frequency * face_value)
+    cf[-1] += face_value
+
+    job = {"kind": kind, "curve": curve, "tenors": tenors, "curve_date": curve_date, "t": t, "cf": cf, "frequency": frequency, "future": Future()}
+    if kind == "krd":
+        krd_tenors = payload.get("tenors", KEY_RATE_TENORS)
+        # A bare string would otherwise be split into characters
+        if not isinstance(krd_tenors, (list, tuple)):
+            raise ValueError("tenors must be a list of tenor labels.")
+        job["krd_tenors"] = list(krd_tenors)
+        missing = [tenor for tenor in job["krd_tenors"] if tenor not in tenors]
+        if missing:
+            raise ValueError(f"Tenors {missing} not found in the yield curve.")
+        job["shock_size_bp"] = float(payload.get("shock_size_bp", service["config"]["monte_carlo"]["shock_size_bp"]))
+        if job["shock_size_bp"] == 0:
+            raise ValueError("shock_size_bp must be non-zero to compute key rate duration.")
+    return job
+
+def resolve_curve(service, payload):
+    """Picks the curve a request is priced on.
+    Args:
+        service (dict): The service state returned by create_service.
+        payload (dict): The request body.
+    Returns:
+        tuple: (curve date, tenor labels, node yields).
+    """
+    refresh_latest_curve(service)
+    curve_date, tenors, latest = service["latest"]
+
+    if "curve" in payload:
+        missing = [tenor for tenor in tenors if tenor not in payload["curve"]]
+        if missing:
+            raise ValueError(f"curve is missing tenors {missing}.")
+        curve_date = pd.Timestamp(payload.get("date", curve_date))
+        return curve_date, tenors, np.array([payload["curve"][tenor] for tenor in tenors], dtype=float)
+
+    if "sim_id" in payload:
+        sim_index = service["sim_index"]
+        if sim_index is None:
+            raise ValueError("Simulated curves are not loaded (pricing_service.load_simulated_cube).")
+        if "date" not in payload:
+            raise ValueError("date is required with sim_id.")
+        if payload["sim_id"] not in sim_index["path_pos"]:
+            raise ValueError(f"Path ID {payload['sim_id']} not found in simulated yield curves.")
+        from shared_cube import sim_curves_on_date
+        sim_date, curves = sim_curves_on_date(sim_index, pd.Timestamp(payload["date"]))
+        return sim_date, sim_index["tenors"], np.asarray(curves[sim_index["path_pos"][payload["sim_id"]]], dtype=float)
+
+    return curve_date, tenors, latest
+
+def submit(service, kind, payload):
+    """Queues a request for the next batch and waits for its result.
+    Args:
+        service (dict): The service state returned by create_service.
+        kind (str): "price" or "krd".
+        payload (dict): The request body, see build_job.
+    Returns:
+        dict: The pricing result.
+    """
+    job = build_job(service, kind, payload)
+    service["requests"].put(job)
+    return job["future"].result()
+
+def _batch_loop(service):
+    """Collects queued requests for up to max_wait after the first one arrives and prices them together."""
+    requests = service["requests"]
+    while not service["stop"].is_set():
+        try:
+            batch = [requests.get(timeout=0.1)]
+        except queue.Empty:
+            continue
+        deadline = time.perf_counter() + service["max_wait"]
+        while len(batch) < service["max_batch_size"]:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(requests.get(timeout=remaining) if remaining > 0 else requests.get_nowait())
+            except queue.Empty:
+                break
+
+        with service["lock"]:
+            service["batch_sizes"].append(len(batch))
+        try:
+            results = price_batch(batch)
+        except Exception as exc:
+            for job in batch:
+                job["future"].set_exception(exc)
+            continue
+        for job, result in zip(batch, results):
+            job["future"].set_result(result)
+
+def price_batch(jobs):
+    """Prices a batch of jobs with one vectorized pricer call per curve tenor set (and KRD shock size).
+    Bonds with different numbers of cashflows are padded to a common length and masked.
+    Args:
+        jobs (list of dict): Jobs returned by build_job.
+    Returns:
+        list of dict: One result per job, in order.
+    """
+    results = [None] * len(jobs)
+    groups = {}
+    for i, job in enumerate(jobs):
+        groups.setdefault(tuple(job["tenors"]), []).append(i)
+
+    for tenors, idx in groups.items():
+        tenors = list(tenors)
+        n_cf = max(len(jobs[i]["t"]) for i in idx)
+        curves = np.empty((len(idx), len(tenors)))
+        t = np.zeros((len(idx), n_cf))
+        cf = np.zeros((len(idx), n_cf))
+        mask = np.zeros((len(idx), n_cf), dtype=bool)
+        frequency = np.empty(len(idx))
+        for row, i in enumerate(idx):
+            job = jobs[i]
+            n = len(job["t"])
+            curves[row] = job["curve"]
+            t[row, :n] = job["t"]
+            cf[row, :n] = job["cf"]
+            mask[row, :n] = True
+            frequency[row] = job["frequency"]
+
+        metrics = batch_price_duration_convexity(curves, tenors, t, cf, frequency, mask)
+        for row, i in enumerate(idx):
+            results[i] = {
+                "curve_date": str(jobs[i]["curve_date"].date()),
+                "price": float(metrics["price"][row]),
+                "macaulay_duration": float(metrics["macaulay_duration"][row]),
+                "modified_duration": float(metrics["modified_duration"][row]),
+                "convexity": float(metrics["convexity"][row]),
+            }
+
+        krd_rows = {}
+        for row, i in enumerate(idx):
+            if jobs[i]["kind"] == "krd":
+                krd_rows.setdefault(jobs[i]["shock_size_bp"], []).append(row)
+        for shock_size_bp, rows in krd_rows.items():
+            krd_tenors = list(dict.fromkeys(tenor for row in rows for tenor in jobs[idx[row]]["krd_tenors"]))
+            krd = compute_krd_batch(curves[rows], tenors, krd_tenors, t[rows], cf[rows], frequency[rows], shock_size_bp, mask[rows])
+            for pos, row in enumerate(rows):
+                job = jobs[idx[row]]
+                results[idx[row]]["krd"] = {tenor: float(krd[tenor][pos]) for tenor in job["krd_tenors"]}
+    return results
+
+def record_latency(service, endpoint, seconds, status=200):
+    """Adds a request latency to the rolling window of its endpoint and response status."""
+    with service["lock"]:
+        window = service["latencies"].setdefault((endpoint, status), deque(maxlen=service["latency_window"]))
+        window.append(seconds)
+
+def _latency_summary(ms):
+    """Count, p50, p99 and max of latencies in milliseconds."""
+    return {
+        "count": int(len(ms)),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+def latency_metrics(service):
+    """Summarises the rolling request latencies and batch sizes.
+    Args:
+        service (dict): The service state returned by create_service.
+    Returns:
+        dict: Per-endpoint count, p50, p99 and max latency in milliseconds over all responses, the same split by
+        response status, plus batch size statistics.
+    """
+    with service["lock"]:
+        latencies = {key: np.array(window) * 1000.0 for key, window in service["latencies"].items()}
+        batch_sizes = np.array(service["batch_sizes"])
+
+    metrics = {"uptime_s": time.time() - service["started"], "endpoints": {}}
+    for endpoint in sorted({endpoint for endpoint, _ in latencies}):
+        by_status = {status: ms for (name, status), ms in sorted(latencies.items()) if name == endpoint}
+        metrics["endpoints"][endpoint] = _latency_summary(np.concatenate(list(by_status.values())))
+        metrics["endpoints"][endpoint]["status"] = {str(status): _latency_summary(ms) for status, ms in by_status.items()}
+    if len(batch_sizes):
+        metrics["batches"] = {"count": int(len(batch_sizes)), "mean_size": float(batch_sizes.mean()), "max_size": int(batch_sizes.max())}
+    return metrics
+
+def make_handler(service):
+    """Builds the HTTP request handler bound to a service.
+    Endpoints: POST /price, POST /krd (JSON bond terms, see build_job), GET /metrics and GET /health.
+    Args:
+        service (dict): The service state returned by create_service.
+    Returns:
+        type: A BaseHTTPRequestHandler subclass.
+    """
+    class PricingHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                curve_date, tenors, _ = service["latest"]
+                self._send(200, {
+                    "status": "ok",
+                    "curve_date": str(curve_date.date()),
+                    "tenors": tenors,
+                    "simulated_cube": service["sim_index"] is not None,
+                    "queued": service["requests"].qsize(),
+                })
+            elif self.path == "/metrics":
+                self._send(200, latency_metrics(service))
+            else:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+
+        def do_POST(self):
+            start = time.perf_counter()
+            kind = self.path.strip("/")
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            if kind not in ("price", "krd"):
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+            status = 500
+            try:
+                try:
+                    payload = json.loads(body or b"{}")
+                    result = submit(service, kind, payload)
+                    status = 200
+                except (ValueError, TypeError, KeyError) as exc:
+                    status, result = 400, {"error": str(exc)}
+                except Exception as exc:
+                    result = {"error": str(exc)}
+                self._send(status, result)
+            finally:
+                # Failed requests count towards the percentiles too, labelled by status
+                record_latency(service, kind, time.perf_counter() - start, status)
+
+        def log_message(self, format, *args):
+            pass
+
+    return PricingHandler
+
+def serve(service, host="127.0.0.1", port=8765):
+    """Binds the pricing service to a local address; call serve_forever on the result.
+    Args:
+        service (dict): The service state returned by create_service.
+        host (str): Address to bind. Default is localhost only.
+        port (int): Port to bind; 0 picks a free port.
+    Returns:
+        ThreadingHTTPServer: The bound server.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(service), bind_and_activate=False)
+    server.daemon_threads = True
+    # The default listen backlog of 5 resets connections under bursts of concurrent clients
+    server.request_queue_size = 128
+    try:
+        server.server_bind()
+        server.server_activate()
+    except OSError:
+        server.server_close()
+        raise
+    return server
+
+if __name__ == "__main__":
+    main()
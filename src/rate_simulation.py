@@ -9,14 +9,75 @@ config = load_config()
 seed = config["seed"]
 np.random.seed(seed) if seed is not False else None
 
+# Enough significant digits to round-trip each storage dtype through CSV text
+FLOAT_FORMATS = {"float32": "%.9g", "float64": None}
+
 def main():
     """Main function to read PCA results and simulate yield curves."""
     config = load_config()
     processed_data = read_processed_data(config)
-    pca_results = read_pca_results(config)
-    simulated_curves = simulate_yield_curves(pca_results, processed_data, config)
+    method = config.get("simulation_method", "var")
+    if method == "historical":
+        # Imported here so the VAR pipeline does not depend on the bootstrap module
+        from historical_simulation import simulate_historical_curves
+        from pca import read_data
+        simulated_curves = simulate_historical_curves(processed_data, read_data(config), config)
+        factor_paths = None
+    elif method == "var":
+        pca_results = read_pca_results(config)
+        simulated_curves, factor_paths = simulate_yield_curves(pca_results, processed_data, config, return_factors=True)
+    else:
+        raise ValueError(f"Unsupported simulation method: {method}. Use 'var' or 'historical'.")
+
+    dtype = storage_dtype(config)
+    if dtype != np.float64 and config.get("precision", {}).get("compare_float64", False):
+        # Imported here to avoid a circular import; monte_carlo_risk reads this module's outputs
+        from monte_carlo_risk import compare_storage_precision, save_precision_report
+        save_precision_report(config, compare_storage_precision(config, simulated_curves, dtype))
+        print("Storage precision report saved.")
+
+    # Imported here to avoid a circular import; shared_cube reads this module's outputs
+    from shared_cube import remove_descriptor, publish_cube, hold_published_cube
+    # A cube published from earlier simulations must not be picked up in place of the new CSVs
+    remove_descriptor(config)
+
+    simulated_curves = simulated_curves.astype(dtype)
     save_simulated_curves(config, simulated_curves)
+    if factor_paths is not None:
+        factor_paths = factor_paths.astype(dtype)
+        save_simulated_factors(config, factor_paths)
+    else:
+        remove_simulated_factors(config)
+
+    if config.get("shared_memory", {}).get("publish", False):
+        dates, sim_ids, tenors, cube = simulated_curves_to_cube(simulated_curves)
+        factor_cube, factor_names = None, None
+        if factor_paths is not None:
+            _, _, factor_names, factor_cube = simulated_curves_to_cube(factor_paths)
+        publish_cube(config, dates, sim_ids, tenors, cube, factor_cube, factor_names)
+        hold_published_cube(config)
     
+def storage_dtype(config):
+    """Returns the dtype used to store the factor paths, simulated cube and Monte Carlo analytics.
+    Args:
+        config: Configuration dictionary containing the optional precision section.
+    Returns:
+        np.dtype: float64 (default) or float32.
+    """
+    name = config.get("precision", {}).get("storage_dtype", "float64")
+    if name not in FLOAT_FORMATS:
+        raise ValueError(f"Unsupported storage dtype: {name}. Use one of {list(FLOAT_FORMATS)}.")
+    return np.dtype(name)
+
+def storage_float_format(config):
+    """Returns the CSV float format matching the configured storage dtype.
+    Args:
+        config: Configuration dictionary containing the optional precision section.
+    Returns:
+        str: A printf-style float format, or None for pandas' default float64 formatting.
+    """
+    return FLOAT_FORMATS[storage_dtype(config).name]
+
 def read_processed_data(config):
     """Reads the processed yield curve data from CSV file.
     Args:
@@ -45,14 +106,16 @@ def read_pca_results(config):
         "loadings": loadings,
     }
     
-def simulate_yield_curves(pca_results, processed_data, config):
+def simulate_yield_curves(pca_results, processed_data, config, return_factors=False):
     """Simulates yield curves using PCA factors and loadings based on a VAR(1) model.
     Args:
         pca_results (dict): A dictionary containing factors, loadings, and explained variance DataFrames.
         processed_data (pd.DataFrame): DataFrame containing the processed yield curve data.
         config: Configuration dictionary containing simulation parameters.
+        return_factors (bool): If True, also return the simulated daily factor changes.
     Returns:
         pd.DataFrame: A DataFrame containing the simulated yield curves.
+        pd.DataFrame: If return_factors is True, a DataFrame of the simulated factor changes indexed like the curves.
     """
     factors = pca_results['factors']
     loadings = pca_results['loadings']
@@ -98,17 +161,35 @@ def simulate_yield_curves(pca_results, processed_data, config):
     last_date = cleaned_yield_curves.index[-1]
     simulated_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=n_steps, freq='B')
     
-    dfs = []
-    for sim in range(n_simulations):
-        df = pd.DataFrame(simulated_yields[sim], columns=loadings.index)
-        df.index = simulated_dates
-        df["sim_id"] = sim
-        dfs.append(df)
+    simulated_curves = paths_to_frame(simulated_yields, simulated_dates, loadings.index)
+
+    if not return_factors:
+        return simulated_curves
 
-    simulated_curves = pd.concat(dfs).set_index("sim_id", append=True)
+    factor_paths = pd.DataFrame(
+        simulated_factors_changes.reshape(-1, factors.shape[1]),
+        index=simulated_curves.index,
+        columns=loadings.columns,
+    )
+    return simulated_curves, factor_paths
 
-    return simulated_curves
 
+def paths_to_frame(paths, dates, columns):
+    """Flattens a path x step x column array into the long (date, sim_id) simulated curves format.
+    The frame wraps the array without copying it, so the caller must not modify the array afterwards.
+    Args:
+        paths (np.ndarray): Simulated values of shape (n_paths, n_steps, n_columns).
+        dates (pd.DatetimeIndex): The simulated dates, one per step.
+        columns (list of str): Column labels of the last axis.
+    Returns:
+        pd.DataFrame: DataFrame ordered path by path and indexed by (date, sim_id).
+    """
+    n_paths, n_steps, n_columns = paths.shape
+    index = pd.MultiIndex.from_arrays(
+        [np.tile(pd.DatetimeIndex(dates), n_paths), np.repeat(np.arange(n_paths), n_steps)],
+        names=[None, "sim_id"],
+    )
+    return pd.DataFrame(paths.reshape(n_paths * n_steps, n_columns), index=index, columns=columns, copy=False)
 
 def save_simulated_curves(config, simulated_curves):
     """Saves the simulated yield curves to a CSV file in the processed data directory.
@@ -119,7 +200,62 @@ def save_simulated_curves(config, simulated_curves):
     processed_dir = config["data_directory"]["simulations"]
     os.makedirs(processed_dir, exist_ok=True)
     simulated_curves.index.names = ["date", "sim_id"]
-    simulated_curves.to_csv(os.path.join(processed_dir, "simulated_yield_curves.csv"), index=True)
+    simulated_curves.to_csv(os.path.join(processed_dir, "simulated_yield_curves.csv"), index=True, float_format=storage_float_format(config))
+
+def save_simulated_factors(config, factor_paths):
+    """Saves the simulated daily PCA factor changes to a CSV file in the simulations directory.
+    Args:
+        config: Configuration dictionary containing paths.
+        factor_paths (pd.DataFrame): DataFrame of simulated factor changes indexed by (date, sim_id).
+    """
+    sim_dir = config["data_directory"]["simulations"]
+    os.makedirs(sim_dir, exist_ok=True)
+    factor_paths.index.names = ["date", "sim_id"]
+    factor_paths.to_csv(os.path.join(sim_dir, "simulated_factor_paths.csv"), index=True, float_format=storage_float_format(config))
+
+def remove_simulated_factors(config):
+    """Removes saved factor paths left by an earlier VAR run, so readers do not pair them with other curves.
+    Args:
+        config: Configuration dictionary containing paths.
+    """
+    factors_path = os.path.join(config["data_directory"]["simulations"], "simulated_factor_paths.csv")
+    if os.path.exists(factors_path):
+        os.remove(factors_path)
+
+def read_simulated_factors(config):
+    """Reads the simulated daily PCA factor changes from the simulations directory.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        pd.DataFrame: DataFrame of simulated factor changes indexed by (date, sim_id), in the configured storage dtype.
+    """
+    factors_path = os.path.join(config["data_directory"]["simulations"], "simulated_factor_paths.csv")
+    return pd.read_csv(factors_path, index_col=[0, 1], parse_dates=[0]).astype(storage_dtype(config))
+
+def read_simulated_curves(config):
+    """Reads the simulated yield curves from the simulations directory.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        pd.DataFrame: DataFrame of simulated yield curves indexed by (date, sim_id), in the configured storage dtype.
+    """
+    sim_curves_path = os.path.join(config["data_directory"]["simulations"], "simulated_yield_curves.csv")
+    return pd.read_csv(sim_curves_path, index_col=[0, 1], parse_dates=[0]).astype(storage_dtype(config))
+
+def simulated_curves_to_cube(simulated_curves):
+    """Reshapes the long (date, sim_id) simulated curves into a dense date x path x tenor cube.
+    Args:
+        simulated_curves (pd.DataFrame): DataFrame of simulated yield curves indexed by (date, sim_id).
+    Returns:
+        tuple: (dates, sim_ids, tenors, cube) where cube has shape (n_dates, n_paths, n_tenors) and keeps the frame's float dtype.
+    """
+    curves = simulated_curves.sort_index()
+    dates = curves.index.get_level_values(0).unique()
+    sim_ids = curves.index.get_level_values(1).unique()
+    if len(curves) != len(dates) * len(sim_ids):
+        raise ValueError("Simulated yield curves do not form a complete date x path grid.")
+    cube = curves.to_numpy(dtype=np.result_type(*curves.dtypes, np.float32)).reshape(len(dates), len(sim_ids), curves.shape[1])
+    return dates, sim_ids, list(curves.columns), cube
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,224 @@
+import pandas as pd
+import numpy as np
+import os
+import itertools
+from config_loader import load_config
+from bond_analytics import generate_cashflows, year_fractions, batch_price_duration_convexity, sort_curve_nodes
+from key_rate_duration import compute_krd_batch, KEY_RATE_TENORS
+from rate_simulation import read_processed_data, read_pca_results
+
+def main():
+    """Main function to build the deterministic scenario set and reprice the bond under every scenario."""
+    config = load_config()
+    scenario_config = config["scenarios"]
+    curves = read_processed_data(config)
+    base_date = resolve_base_date(curves.index, scenario_config["base_date"])
+    base_curve = curves.loc[[base_date]]
+
+    shocks = build_shock_matrix(list(curves.columns), read_pca_results(config)["loadings"], scenario_config)
+
+    settlement_date = pd.to_datetime(config["bond"]["settlement_date"])
+    if settlement_date < base_date:
+        settlement_date = base_date
+
+    analytics_df = run_scenarios(
+        base_curve,
+        shocks,
+        settlement_date,
+        pd.to_datetime(config["bond"]["maturity_date"]),
+        config["bond"]["coupon_rate"],
+        config["bond"]["frequency"],
+        config["bond"]["face_value"],
+        config["bond"]["business_day_convention"],
+        config["bond"]["day_count_convention"],
+        config["monte_carlo"]["shock_size_bp"],
+    )
+    save_scenario_analytics(config, analytics_df)
+    print(f"Repriced {len(analytics_df)} scenarios on {base_date.date()}.")
+
+def resolve_base_date(dates, base_date=None):
+    """Resolves the configured base date to the most recent curve date on or before it.
+    Args:
+        dates (pd.DatetimeIndex): Sorted dates of the cleaned curves.
+        base_date: The requested base date (anything pd.to_datetime accepts); None uses the last date.
+    Returns:
+        pd.Timestamp: The curve date to shock, e.g. the Friday before a weekend base date.
+    """
+    if base_date is None:
+        return dates[-1]
+    requested = pd.to_datetime(base_date)
+    pos = dates.get_indexer([requested], method="pad")[0]
+    if pos < 0:
+        raise ValueError(f"No cleaned curve on or before base_date {requested.date()}; the first curve is on {dates[0].date()}.")
+    if dates[pos] != requested:
+        print(f"Base date {requested.date()} is not a curve date, using {dates[pos].date()}.")
+    return dates[pos]
+
+def parallel_shocks(tenor_years, sizes_bp):
+    """Builds parallel shift shocks.
+    Args:
+        tenor_years (np.ndarray): Curve node maturities in years.
+        sizes_bp (list of float): Shift sizes in basis points.
+    Returns:
+        dict: Scenario name to shock vector in basis points.
+    """
+    return {f"parallel_{s:+g}bp": np.full(len(tenor_years), float(s)) for s in sizes_bp}
+
+def _log_tenor_position(tenor_years):
+    """Maps maturities to [0, 1] on a log scale, so the short end is not squeezed against the 30Y node."""
+    x = np.log(np.asarray(tenor_years, dtype=float))
+    return (x - x.min()) / (x.max() - x.min())
+
+def twist_shocks(tenor_years, sizes_bp):
+    """Builds twist shocks rotating the curve around its log-maturity midpoint.
+    A positive size steepens the curve: the shortest tenor moves by -size/2 and the longest by +size/2.
+    Args:
+        tenor_years (np.ndarray): Curve node maturities in years.
+        sizes_bp (list of float): Twist sizes in basis points.
+    Returns:
+        dict: Scenario name to shock vector in basis points.
+    """
+    shape = _log_tenor_position(tenor_years) - 0.5
+    return {f"twist_{s:+g}bp": s * shape for s in sizes_bp}
+
+def butterfly_shocks(tenor_years, sizes_bp):
+    """Builds butterfly shocks moving the wings against the belly.
+    A positive size raises both ends of the curve by size and lowers the log-maturity midpoint by size.
+    Args:
+        tenor_years (np.ndarray): Curve node maturities in years.
+        sizes_bp (list of float): Butterfly sizes in basis points.
+    Returns:
+        dict: Scenario name to shock vector in basis points.
+    """
+    shape = 2 * np.abs(2 * _log_tenor_position(tenor_years) - 1) - 1
+    return {f"butterfly_{s:+g}bp": s * shape for s in sizes_bp}
+
+def pca_factor_shocks(loadings, sizes_bp, full_grid=False):
+    """Builds shocks along the PCA loadings.
+    A size is a move in the factor score, so a shock maps to tenors exactly like a simulated factor change
+    does in rate_simulation (curve change = factor change @ loadings.T).
+    Args:
+        loadings (pd.DataFrame): PCA loadings with tenors as the index and PCs as the columns.
+        sizes_bp (list of float): Factor shock sizes in basis points.
+        full_grid (bool): If True, shock all factors jointly over the Cartesian product of sizes.
+    Returns:
+        dict: Scenario name to shock vector in basis points.
+    """
+    L = loadings.to_numpy(dtype=float)
+    pcs = list(loadings.columns)
+    if not full_grid:
+        return {f"{pc}_{s:+g}bp": s * L[:, i] for i, pc in enumerate(pcs) for s in sizes_bp}
+    sizes = np.array(list(itertools.product(sizes_bp, repeat=len(pcs))), dtype=float)
+    vectors = sizes @ L.T
+    names = ["_".join(f"{pc}{s:+g}" for pc, s in zip(pcs, row)) + "bp" for row in sizes]
+    return dict(zip(names, vectors))
+
+def custom_shocks(tenors, custom):
+    """Builds user-defined shocks.
+    Args:
+        tenors (list of str): Curve tenor labels.
+        custom (dict): Scenario name to either a list of basis point shocks (one per tenor, in curve order)
+            or a dict of tenor to basis point shock (missing tenors are not shocked).
+    Returns:
+        dict: Scenario name to shock vector in basis points.
+    """
+    shocks = {}
+    for name, vector in (custom or {}).items():
+        if isinstance(vector, dict):
+            unknown = [tenor for tenor in vector if tenor not in tenors]
+            if unknown:
+                raise ValueError(f"Tenors {unknown} in custom scenario '{name}' not found in the yield curve.")
+            shocks[name] = np.array([float(vector.get(tenor, 0.0)) for tenor in tenors])
+        else:
+            if len(vector) != len(tenors):
+                raise ValueError(f"Custom scenario '{name}' has {len(vector)} shocks, expected {len(tenors)}.")
+            shocks[name] = np.asarray(vector, dtype=float)
+    return shocks
+
+def build_shock_matrix(tenors, loadings, scenario_config):
+    """Builds the (scenario x tenor) shock matrix from the scenarios config section.
+    Args:
+        tenors (list of str): Curve tenor labels.
+        loadings (pd.DataFrame): PCA loadings with tenors as the index and PCs as the columns.
+        scenario_config (dict): The scenarios section of the configuration.
+    Returns:
+        pd.DataFrame: Shocks in basis points indexed by scenario name with tenor columns.
+    """
+    # Node shapes are computed on the curve's own column order, which may not be sorted by maturity
+    order, sorted_years = sort_curve_nodes(tenors)
+    tenor_years = np.empty(len(tenors))
+    tenor_years[order] = sorted_years
+
+    shocks = {"base": np.zeros(len(tenors))}
+    shocks.update(parallel_shocks(tenor_years, scenario_config.get("parallel_bp") or []))
+    shocks.update(twist_shocks(tenor_years, scenario_config.get("twist_bp") or []))
+    shocks.update(butterfly_shocks(tenor_years, scenario_config.get("butterfly_bp") or []))
+    shocks.update(pca_factor_shocks(loadings.loc[tenors], scenario_config.get("pca_factor_bp") or [], scenario_config.get("pca_full_grid", False)))
+    shocks.update(custom_shocks(tenors, scenario_config.get("custom")))
+
+    shock_matrix = pd.DataFrame(np.vstack(list(shocks.values())), index=list(shocks.keys()), columns=tenors)
+    shock_matrix.index.name = "scenario"
+    return shock_matrix
+
+def apply_shocks(base_curve, shock_matrix):
+    """Applies every scenario to the base curve with one broadcasted add.
+    Args:
+        base_curve (pd.DataFrame): Single-row DataFrame containing the base yield curve.
+        shock_matrix (pd.DataFrame): Shocks in basis points indexed by scenario with tenor columns.
+    Returns:
+        np.ndarray: Shocked curves of shape (n_scenarios, n_tenors), in the units of the base curve.
+    """
+    base = base_curve[shock_matrix.columns].to_numpy(dtype=float)[0]
+    return base[None, :] + shock_matrix.to_numpy(dtype=float) / 10000.0
+
+def run_scenarios(base_curve, shock_matrix, settlement_date, maturity_date, coupon_rate, frequency=2, face_value=100, business_day_convention="following", day_count_convention="ACT/365", shock_size_bp=1.0, tenors=KEY_RATE_TENORS):
+    """Reprices the bond under every scenario in a single batched pricing pass.
+    Args:
+        base_curve (pd.DataFrame): Single-row DataFrame containing the base yield curve, indexed by date.
+        shock_matrix (pd.DataFrame): Shocks in basis points indexed by scenario with tenor columns.
+        settlement_date (pd.Timestamp): The settlement date of the bond.
+        maturity_date (pd.Timestamp): The maturity date of the bond.
+        coupon_rate (float): The annual coupon rate as a decimal.
+        frequency (int): Number of coupon payments per year.
+        face_value (float): The face value of the bond. Default is 100.
+        business_day_convention (str): The business day convention to use. Default is "following".
+        day_count_convention (str): The day count convention to use. Default is "ACT/365".
+        shock_size_bp (float): The size of the shock in basis points for the KRDs. Default is 1.0.
+        tenors (list of str): Tenors to compute key rate durations for.
+    Returns:
+        pd.DataFrame: A DataFrame containing bond analytics and P&L versus the base curve for each scenario.
+    """
+    curve_date = pd.Timestamp(base_curve.index[0])
+    cash_flows_df = generate_cashflows(settlement_date, maturity_date, coupon_rate, frequency, face_value, business_day_convention)
+    t = year_fractions(curve_date, cash_flows_df["date"].to_numpy(dtype="datetime64[D]"), day_count_convention)
+    cf = cash_flows_df["cashflow_amount"].to_numpy(dtype=float)
+
+    base_price = batch_price_duration_convexity(base_curve.to_numpy(dtype=float), list(base_curve.columns), t, cf, frequency)["price"][0]
+    shocked = apply_shocks(base_curve, shock_matrix)
+    curve_tenors = list(shock_matrix.columns)
+    metrics = batch_price_duration_convexity(shocked, curve_tenors, t, cf, frequency)
+    krd_vector = compute_krd_batch(shocked, curve_tenors, tenors, t, cf, frequency, shock_size_bp)
+
+    analytics_df = pd.DataFrame({
+        "scenario": shock_matrix.index,
+        "price": metrics["price"],
+        "pnl": metrics["price"] - base_price,
+        "modified_duration": metrics["modified_duration"],
+        "convexity": metrics["convexity"],
+    })
+    for tenor, krd in krd_vector.items():
+        analytics_df[f"krd_{tenor}"] = krd
+    return analytics_df
+
+def save_scenario_analytics(config, analytics_df):
+    """Saves the scenario analytics to CSV file.
+    Args:
+        config: Configuration dictionary containing paths.
+        analytics_df (pd.DataFrame): DataFrame containing the scenario analytics.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    analytics_df.to_csv(os.path.join(reports_dir, "scenario_analytics.csv"), index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import pandas as pd
+import numpy as np
+import os
+import json
+import atexit
+import signal
+from multiprocessing import shared_memory, resource_tracker
+from config_loader import load_config
+from rate_simulation import read_simulated_curves, read_simulated_factors, simulated_curves_to_cube, storage_dtype
+
+DESCRIPTOR_FILE = "shared_cube.json"
+SOURCE_FILES = {"cube": "simulated_yield_curves.csv", "factors": "simulated_factor_paths.csv"}
+
+# Keeps an attached shared memory cube (and its blocks) alive for the lifetime of the process
+_shared_cube = None
+
+def main():
+    """Main function to publish the saved simulated cube in shared memory and hold it until interrupted."""
+    config = load_config()
+    # Taken before reading, so a rewrite while loading makes the published cube stale rather than mislabelled
+    sources = source_signatures(config)
+    dates, sim_ids, tenors, cube = simulated_curves_to_cube(read_simulated_curves(config))
+    factor_cube, factor_names = None, None
+    if sources["factors"] is not None:
+        _, _, factor_names, factor_cube = simulated_curves_to_cube(read_simulated_factors(config))
+
+    publish_cube(config, dates, sim_ids, tenors, cube, factor_cube, factor_names, sources)
+    hold_published_cube(config)
+
+def descriptor_path(config):
+    """Returns the path of the shared cube descriptor file.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        str: Path to the descriptor JSON file in the simulations directory.
+    """
+    return os.path.join(config["data_directory"]["simulations"], DESCRIPTOR_FILE)
+
+def source_signatures(config):
+    """Identifies the saved simulation CSVs by size and modification time.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        dict: For "cube" and "factors", [size, mtime_ns] of the source CSV, or None if it does not exist.
+    """
+    signatures = {}
+    for key, filename in SOURCE_FILES.items():
+        path = os.path.join(config["data_directory"]["simulations"], filename)
+        try:
+            stat = os.stat(path)
+            signatures[key] = [stat.st_size, stat.st_mtime_ns]
+        except FileNotFoundError:
+            signatures[key] = None
+    return signatures
+
+def remove_descriptor(config):
+    """Removes the shared cube descriptor so consumers stop attaching to a cube built from earlier simulations.
+    A publisher that is still running keeps its blocks until it exits; it only loses its descriptor.
+    Args:
+        config: Configuration dictionary containing paths.
+    """
+    try:
+        os.remove(descriptor_path(config))
+    except FileNotFoundError:
+        pass
+
+def _create_block(name, array):
+    """Copies an array into a new named shared memory block."""
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block
+
+def publish_cube(config, dates, sim_ids, tenors, cube, factor_cube=None, factor_names=None, sources=None):
+    """Places the simulated date x path x tenor cube (and factor paths) in named shared memory blocks.
+    A small JSON descriptor with the block names, shapes, dtypes, labels and the signatures of the source CSVs
+    is written to the simulations directory so other local processes can attach, and can tell whether the
+    cube still matches the saved simulations. The blocks and the descriptor are removed when this process exits.
+    Args:
+        config: Configuration dictionary containing paths.
+        dates (pd.DatetimeIndex): Simulated dates.
+        sim_ids (pd.Index): Simulation path ids.
+        tenors (list of str): Tenor labels of the last cube axis.
+        cube (np.ndarray): Simulated curves of shape (n_dates, n_paths, n_tenors).
+        factor_cube (np.ndarray): Optional simulated factor changes of shape (n_dates, n_paths, n_factors).
+        factor_names (list of str): Factor labels of the last factor_cube axis.
+        sources (dict): Source CSV signatures from source_signatures, taken when the arrays were read. Defaults to
+            the signatures of the CSVs on disk now.
+    Returns:
+        dict: The descriptor that was written.
+    """
+    prefix = f"yc_{os.getpid()}"
+    arrays = {"cube": np.ascontiguousarray(cube)}
+    if factor_cube is not None:
+        arrays["factors"] = np.ascontiguousarray(factor_cube)
+
+    blocks = []
+    descriptor = {
+        "owner_pid": os.getpid(),
+        "dates": [str(d.date()) for d in pd.DatetimeIndex(dates)],
+        "sim_ids": [int(i) for i in sim_ids],
+        "tenors": list(tenors),
+        "factor_names": list(factor_names) if factor_names is not None else None,
+        "sources": source_signatures(config) if sources is None else sources,
+        "blocks": {},
+    }
+    for key, array in arrays.items():
+        block = _create_block(f"{prefix}_{key}", array)
+        blocks.append(block)
+        descriptor["blocks"][key] = {"name": block.name, "shape": list(array.shape), "dtype": array.dtype.str}
+
+    path = descriptor_path(config)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(descriptor, f)
+
+    def cleanup():
+        # A second signal while unlinking would otherwise leave blocks and the descriptor behind
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for block in blocks:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        blocks.clear()
+        # Only remove the descriptor if it still points at our blocks
+        try:
+            with open(path) as f:
+                if json.load(f).get("owner_pid") == os.getpid():
+                    os.remove(path)
+        except (FileNotFoundError, ValueError):
+            pass
+
+    atexit.register(cleanup)
+    print(f"Published simulated cube {cube.shape} in shared memory, descriptor at {path}")
+    return descriptor
+
+def hold_published_cube(config):
+    """Keeps the owning process alive so the published blocks stay available; exits cleanly on Ctrl-C or SIGTERM.
+    Args:
+        config: Configuration dictionary containing paths.
+    """
+    print("Holding shared memory cube. Press Ctrl-C to release it.")
+    # SIGTERM is handled like Ctrl-C so the blocks are released by the atexit cleanup
+    previous = signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        signal.pause()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    print(f"Releasing shared memory cube ({descriptor_path(config)}).")
+
+def _attach_block(name):
+    """Attaches to an existing shared memory block without letting this process unlink it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers attached blocks with the resource tracker, which would unlink them
+        block = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+def stale_reason(config, descriptor):
+    """Checks a descriptor against the saved simulations and the configured storage dtype.
+    Args:
+        config: Configuration dictionary containing paths and the precision section.
+        descriptor (dict): The descriptor written by publish_cube.
+    Returns:
+        str: Why the published cube no longer matches, or None if it does.
+    """
+    if descriptor.get("sources") != source_signatures(config):
+        return "the simulation CSVs changed since it was published"
+    blocks = descriptor["blocks"]
+    expected_shape = [len(descriptor["dates"]), len(descriptor["sim_ids"]), len(descriptor["tenors"])]
+    if blocks["cube"]["shape"] != expected_shape:
+        return f"cube shape {blocks['cube']['shape']} does not match its labels {expected_shape}"
+    if "factors" in blocks and blocks["factors"]["shape"][:2] != expected_shape[:2]:
+        return f"factor shape {blocks['factors']['shape']} does not match the cube {expected_shape}"
+    dtype = storage_dtype(config)
+    if any(np.dtype(spec["dtype"]) != dtype for spec in blocks.values()):
+        return f"it is not stored as the configured {dtype.name}"
+    return None
+
+def attach_cube(config):
+    """Attaches to a published simulated cube as zero-copy, read-only NumPy views.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        dict: dates, sim_ids, tenors, cube and (if published) factors and factor_names; None if no cube is
+        published or the published cube no longer matches the saved simulations.
+    """
+    path = descriptor_path(config)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        descriptor = json.load(f)
+    reason = stale_reason(config, descriptor)
+    if reason is not None:
+        print(f"Ignoring shared memory cube ({path}): {reason}. Reading the CSVs instead.")
+        return None
+
+    attached = {
+        "dates": pd.DatetimeIndex(pd.to_datetime(descriptor["dates"])),
+        "sim_ids": pd.Index(descriptor["sim_ids"]),
+        "tenors": descriptor["tenors"],
+        "factor_names": descriptor["factor_names"],
+        "blocks": [],
+    }
+    try:
+        for key, spec in descriptor["blocks"].items():
+            block = _attach_block(spec["name"])
+            view = np.ndarray(tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]), buffer=block.buf)
+            view.flags.writeable = False
+            attached["blocks"].append(block)
+            attached[key] = view
+    except FileNotFoundError:
+        # Stale descriptor left behind by an owner that did not exit cleanly
+        release_cube(attached)
+        return None
+    return attached
+
+def release_cube(attached):
+    """Detaches from a published cube. The views must not be used afterwards.
+    Args:
+        attached (dict): The dictionary returned by attach_cube.
+    """
+    for key in ("cube", "factors"):
+        attached.pop(key, None)
+    for block in attached["blocks"]:
+        block.close()
+    attached["blocks"] = []
+
+def attach_shared_cube(config):
+    """Attaches (once per process) to the published shared memory cube.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        dict: The attached cube as returned by attach_cube, or None if no valid cube is published.
+    """
+    global _shared_cube
+    if _shared_cube is None:
+        _shared_cube = attach_cube(config)
+    return _shared_cube
+
+def load_simulated_cube(config):
+    """Loads the simulated date x path x tenor cube, attaching zero-copy to a published shared memory cube if there is one.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        tuple: (dates, sim_ids, tenors, cube) where cube has shape (n_dates, n_paths, n_tenors).
+    """
+    if attach_shared_cube(config) is not None:
+        return _shared_cube["dates"], _shared_cube["sim_ids"], _shared_cube["tenors"], _shared_cube["cube"]
+    return simulated_curves_to_cube(read_simulated_curves(config))
+
+def load_simulated_factor_cube(config):
+    """Loads the simulated factor changes as a date x path x factor cube, preferring a published shared memory cube.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        tuple: (factor_names, factor_cube), or None if no factor paths were saved.
+    """
+    if attach_shared_cube(config) is not None and "factors" in _shared_cube:
+        return _shared_cube["factor_names"], _shared_cube["factors"]
+    if not os.path.exists(os.path.join(config["data_directory"]["simulations"], SOURCE_FILES["factors"])):
+        return None
+    _, _, factor_names, factor_cube = simulated_curves_to_cube(read_simulated_factors(config))
+    return factor_names, factor_cube
+
+def build_sim_curve_index(dates, sim_ids, tenors, cube):
+    """Builds a positional index over the simulated cube for constant-time curve lookups.
+    Args:
+        dates (pd.DatetimeIndex): Sorted simulated dates (first cube axis).
+        sim_ids (pd.Index): Simulation path ids (second cube axis).
+        tenors (list of str): Tenor labels (last cube axis).
+        cube (np.ndarray): Simulated curves of shape (n_dates, n_paths, n_tenors).
+    Returns:
+        dict: The dates, path ids, tenors and cube, plus a hash lookup from path id to array position.
+    """
+    return {
+        "dates": pd.DatetimeIndex(dates),
+        "sim_ids": pd.Index(sim_ids),
+        "path_pos": {sim_id: pos for pos, sim_id in enumerate(sim_ids)},
+        "tenors": list(tenors),
+        "cube": cube,
+    }
+
+def load_sim_curve_index(config):
+    """Loads the simulated cube (shared memory or CSV) and builds its positional index.
+    Args:
+        config: Configuration dictionary containing paths.
+    Returns:
+        dict: The index returned by build_sim_curve_index.
+    """
+    return build_sim_curve_index(*load_simulated_cube(config))
+
+def resolve_sim_date_position(sim_dates, date, max_lookback_days=5):
+    """Resolves a date to itself or the nearest previous simulated date with a single binary search.
+    Args:
+        sim_dates (pd.DatetimeIndex): The sorted simulated dates.
+        date (pd.Timestamp): The requested date.
+        max_lookback_days (int): Maximum number of calendar days to look back.
+    Returns:
+        tuple: (resolved date, its position in sim_dates).
+    """
+    date = pd.Timestamp(date)
+    pos = sim_dates.searchsorted(date, side="right") - 1
+    if pos < 0 or date - sim_dates[pos] > pd.Timedelta(days=max_lookback_days):
+        raise ValueError(f"Date {date} not found in simulated yield curves.")
+    return sim_dates[pos], pos
+
+def resolve_sim_date(sim_dates, date, max_lookback_days=5):
+    """Resolves a date to itself or the nearest previous simulated date.
+    Args:
+        sim_dates (pd.DatetimeIndex): The sorted simulated dates.
+        date (pd.Timestamp): The requested date.
+        max_lookback_days (int): Maximum number of calendar days to look back.
+    Returns:
+        pd.Timestamp: The resolved simulated date.
+    """
+    return resolve_sim_date_position(sim_dates, date, max_lookback_days)[0]
+
+def sim_curves_on_date(sim_index, date, max_lookback_days=5):
+    """Returns the curves of every path on a date as a slice view of the cube.
+    Args:
+        sim_index (dict): The index returned by build_sim_curve_index.
+        date (pd.Timestamp): The requested date; resolved to the nearest previous simulated date.
+        max_lookback_days (int): Maximum number of calendar days to look back.
+    Returns:
+        tuple: (resolved date, curves of shape (n_paths, n_tenors)).
+    """
+    curve_date, date_pos = resolve_sim_date_position(sim_index["dates"], date, max_lookback_days)
+    return curve_date, sim_index["cube"][date_pos]
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-from key_rate_duration import KEY_RATE_TENORS
 
 def plot_distribution(data, column, bins=50, title=None):
     """Plots the distribution of a specified column in the data and returns the figure."""
@@ -44,6 +43,35 @@ def plot_krd_fan(krd_df, title="KRD Fan Chart"):
     return fig
 
 
+def plot_krd_fan_bands(krd_df, percentiles=(5, 25, 75, 95), title="KRD Fan Chart"):
+    """Plots a fan chart of KRD percentile bands across paths (one filled region per outer/inner percentile pair).
+    With an odd number of percentiles the unpaired middle one is drawn as a line."""
+    percentiles = sorted(percentiles)
+    values = krd_df.to_numpy(dtype=float)
+    bands = np.percentile(values, percentiles, axis=0)
+    x = np.arange(values.shape[1])
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    n_bands = len(percentiles) // 2
+    for i in range(n_bands):
+        lower, upper = bands[i], bands[-1 - i]
+        ax.fill_between(x, lower, upper, color="steelblue", alpha=0.2 + 0.5 * i / max(n_bands, 1), linewidth=0,
+                        label=f"P{percentiles[i]:g}-P{percentiles[-1 - i]:g}")
+    if len(percentiles) % 2:
+        ax.plot(x, bands[n_bands], color="steelblue", linewidth=1.5, label=f"P{percentiles[n_bands]:g}")
+
+    ax.plot(x, np.median(values, axis=0), color="navy", linewidth=1.5, linestyle="--", label="Median KRD")
+    ax.plot(x, values.mean(axis=0), color="black", linewidth=2, label="Mean KRD")
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(krd_df.columns)
+    ax.set_title(title)
+    ax.set_ylabel("Key Rate Duration")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
 def plot_yield_curves(curves, title="Yield Curve Scenarios"):
     """
     curves: dict {label: dataframe of tenors}
@@ -0,0 +1,243 @@
+import pandas as pd
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from config_loader import load_config
+from rate_simulation import read_processed_data
+from pca import read_data
+
+def main():
+    """Main function to run the walk-forward calibration study of the PCA/VAR simulator."""
+    config = load_config()
+    wf_config = config["walk_forward"]
+    levels = read_processed_data(config)
+    diffs = read_data(config)[levels.columns]
+
+    scores_df = run_walk_forward(
+        levels,
+        diffs,
+        window=wf_config.get("window", "expanding"),
+        window_days=wf_config.get("window_days", 2520),
+        min_window_days=wf_config.get("min_window_days", 504),
+        horizons=wf_config.get("horizons_days", [5, 21, 63]),
+        n_components=wf_config.get("n_components", 3),
+        n_simulations=wf_config.get("num_simulations", 1000),
+        seed=config["seed"],
+        n_workers=wf_config.get("n_workers", 1),
+    )
+    calibration_df, histogram_df = summarize_calibration(scores_df, wf_config.get("coverage_levels", [0.5, 0.9, 0.95]), wf_config.get("pit_bins", 10))
+
+    save_walk_forward_reports(config, scores_df, calibration_df, histogram_df)
+    print(f"Walk-forward calibration scored {scores_df['origin_date'].nunique()} month-end windows.")
+
+def month_end_positions(dates):
+    """Returns the positions of the last available date of every month.
+    Args:
+        dates (pd.DatetimeIndex): Sorted dates.
+    Returns:
+        np.ndarray: Integer positions into dates.
+    """
+    periods = pd.DatetimeIndex(dates).to_period("M")
+    return np.append(np.flatnonzero(periods[1:] != periods[:-1]), len(dates) - 1)
+
+def prefix_statistics(x):
+    """Builds prefix sums of the daily changes, their outer products and their lag-one cross products.
+    Any window's mean, covariance and VAR(1) moment matrices are then differences of two prefix entries.
+    Args:
+        x (np.ndarray): Daily changes of shape (n_days, n_tenors).
+    Returns:
+        dict: s1 (n_days + 1, n_tenors), s2 and lag (n_days + 1, n_tenors, n_tenors), where entry i sums days < i
+        and lag sums x[t] x[t-1]' over 1 <= t < i.
+    """
+    n, k = x.shape
+    s1 = np.zeros((n + 1, k))
+    s2 = np.zeros((n + 1, k, k))
+    lag = np.zeros((n + 1, k, k))
+    np.cumsum(x, axis=0, out=s1[1:])
+    np.cumsum(x[:, :, None] * x[:, None, :], axis=0, out=s2[1:])
+    np.cumsum(x[1:, :, None] * x[:-1, None, :], axis=0, out=lag[2:])
+    return {"s1": s1, "s2": s2, "lag": lag}
+
+def _centered_products(stats, start, stop, mu):
+    """Sum of (x_t - mu)(x_t - mu)' over start <= t < stop."""
+    total = stats["s1"][stop] - stats["s1"][start]
+    n = stop - start
+    return stats["s2"][stop] - stats["s2"][start] - np.outer(total, mu) - np.outer(mu, total) + n * np.outer(mu, mu)
+
+def fit_window(stats, x, start, stop, n_components=3):
+    """Fits PCA and a VAR(1) without trend on the PCA factors of one window, from the prefix statistics only.
+    Matches pca.run_pca (centred components, loadings flipped to a positive sum) followed by the statsmodels
+    VAR fit in rate_simulation (OLS coefficients, residual covariance with a degrees-of-freedom correction).
+    Args:
+        stats (dict): Prefix statistics returned by prefix_statistics.
+        x (np.ndarray): Daily changes of shape (n_days, n_tenors).
+        start (int): First day of the window.
+        stop (int): One past the last day of the window.
+        n_components (int): Number of principal components.
+    Returns:
+        dict: loadings (n_tenors, n_components), A (n_components, n_components), sigma and the last factor value.
+    """
+    n = stop - start
+    mu = (stats["s1"][stop] - stats["s1"][start]) / n
+    cov = _centered_products(stats, start, stop, mu) / (n - 1)
+    eigenvalues, eigenvectors = np.linalg.eigh(cov)
+    loadings = eigenvectors[:, np.argsort(eigenvalues)[::-1][:n_components]]
+    loadings = loadings * np.where(loadings.sum(axis=0) < 0, -1.0, 1.0)
+
+    # Factor moments for y_t = f_t (t = start+1 .. stop-1) and z_t = f_{t-1}
+    zz = loadings.T @ _centered_products(stats, start, stop - 1, mu) @ loadings
+    yy = loadings.T @ _centered_products(stats, start + 1, stop, mu) @ loadings
+    y_sum = stats["s1"][stop] - stats["s1"][start + 1]
+    z_sum = stats["s1"][stop - 1] - stats["s1"][start]
+    lag = stats["lag"][stop] - stats["lag"][start + 1] - np.outer(y_sum, mu) - np.outer(mu, z_sum) + (n - 1) * np.outer(mu, mu)
+    yz = loadings.T @ lag @ loadings
+
+    A = np.linalg.solve(zz, yz.T).T
+    sigma = (yy - yz @ A.T) / (n - 1 - n_components)
+    return {
+        "loadings": loadings,
+        "A": A,
+        "sigma": (sigma + sigma.T) / 2,
+        "initial_state": loadings.T @ (x[stop - 1] - mu),
+    }
+
+def simulate_window(task):
+    """Simulates one window forward and scores the realised curves against the simulated distribution.
+    Args:
+        task (dict): Fitted window (loadings, A, sigma, initial_state) plus base_curve, realized curves by
+            horizon, horizons, n_simulations and seed.
+    Returns:
+        dict: Arrays of shape (n_horizons, n_tenors) with the PIT, simulated mean and simulated std.
+    """
+    rng = np.random.default_rng(task["seed"])
+    n_steps = max(task["horizons"])
+    n_factors = task["A"].shape[0]
+    chol = np.linalg.cholesky(task["sigma"] + 1e-14 * np.eye(n_factors))
+
+    shocks = rng.standard_normal((task["n_simulations"], n_steps, n_factors)) @ chol.T
+    state = np.broadcast_to(task["initial_state"], (task["n_simulations"], n_factors))
+    cumulative = np.zeros((task["n_simulations"], n_factors))
+    at_horizon = {}
+    for step in range(1, n_steps + 1):
+        state = state @ task["A"].T + shocks[:, step - 1]
+        cumulative = cumulative + state
+        if step in task["horizons"]:
+            at_horizon[step] = cumulative.copy()
+
+    pit, mean, std = [], [], []
+    for h, realized in zip(task["horizons"], task["realized"]):
+        simulated = task["base_curve"] + at_horizon[h] @ task["loadings"].T
+        pit.append((simulated <= realized).mean(axis=0))
+        mean.append(simulated.mean(axis=0))
+        std.append(simulated.std(axis=0))
+    return {"pit": np.array(pit), "mean": np.array(mean), "std": np.array(std)}
+
+def run_walk_forward(levels, diffs, window="expanding", window_days=2520, min_window_days=504, horizons=(5, 21, 63), n_components=3, n_simulations=1000, seed=42, n_workers=1):
+    """Refits PCA and the VAR(1) at every month-end, simulates forward and scores the realised curves.
+    The model is the one used by pca.py and rate_simulation.py. Window moments come from prefix sums computed
+    once, so each refit costs O(n_tenors^2) regardless of window length; windows are simulated in parallel.
+    Args:
+        levels (pd.DataFrame): Cleaned yield curves indexed by date.
+        diffs (pd.DataFrame): Cleaned daily changes indexed by date, same columns as levels.
+        window (str): "expanding" (all history to the month-end) or "rolling" (the last window_days changes).
+        window_days (int): Length of the rolling window.
+        min_window_days (int): Minimum number of changes before the first refit.
+        horizons (sequence of int): Forecast horizons in business days to score.
+        n_components (int): Number of principal components.
+        n_simulations (int): Number of simulated paths per window.
+        seed (int): Base random seed; False draws fresh entropy.
+        n_workers (int): Number of worker processes.
+    Returns:
+        pd.DataFrame: One row per (origin date, horizon, tenor) with the realised value, PIT, simulated mean and std.
+    """
+    if window not in ("expanding", "rolling"):
+        raise ValueError(f"Unsupported window: {window}. Use 'expanding' or 'rolling'.")
+    horizons = sorted(horizons)
+    tenors = list(levels.columns)
+    diffs = diffs.loc[diffs.index.isin(levels.index)]
+    x = diffs.to_numpy(dtype=float)
+    level_values = levels.to_numpy(dtype=float)
+    level_pos = levels.index.get_indexer(diffs.index)
+    stats = prefix_statistics(x)
+
+    tasks, origins = [], []
+    for stop_pos in month_end_positions(diffs.index):
+        stop = stop_pos + 1
+        start = max(0, stop - window_days) if window == "rolling" else 0
+        origin = level_pos[stop_pos]
+        if stop - start < min_window_days or origin + horizons[-1] >= len(level_values):
+            continue
+        task = fit_window(stats, x, start, stop, n_components)
+        task.update({
+            "base_curve": level_values[origin],
+            "realized": level_values[origin + np.array(horizons)],
+            "horizons": horizons,
+            "n_simulations": n_simulations,
+            "seed": None if seed is False else [seed, len(tasks)],
+        })
+        tasks.append(task)
+        origins.append(diffs.index[stop_pos])
+    if not tasks:
+        raise ValueError("No month-end windows with enough history and realised horizon data.")
+
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(simulate_window, tasks, chunksize=max(1, len(tasks) // (4 * n_workers))))
+    else:
+        results = [simulate_window(task) for task in tasks]
+
+    n_h, n_t = len(horizons), len(tenors)
+    return pd.DataFrame({
+        "origin_date": np.repeat(origins, n_h * n_t),
+        "horizon_days": np.tile(np.repeat(horizons, n_t), len(tasks)),
+        "tenor": np.tile(tenors, n_h * len(tasks)),
+        "realized": np.concatenate([task["realized"].ravel() for task in tasks]),
+        "pit": np.concatenate([result["pit"].ravel() for result in results]),
+        "sim_mean": np.concatenate([result["mean"].ravel() for result in results]),
+        "sim_std": np.concatenate([result["std"].ravel() for result in results]),
+    })
+
+def summarize_calibration(scores_df, coverage_levels=(0.5, 0.9, 0.95), pit_bins=10):
+    """Summarises the walk-forward scores into coverage rates and PIT histograms.
+    A realised value is inside the central interval at level c when its PIT lies in [(1 - c) / 2, (1 + c) / 2].
+    Args:
+        scores_df (pd.DataFrame): Scores returned by run_walk_forward.
+        coverage_levels (sequence of float): Nominal central interval levels.
+        pit_bins (int): Number of equal-width PIT histogram bins.
+    Returns:
+        tuple: (calibration_df, histogram_df) with one row per (horizon, tenor) and per (horizon, tenor, bin).
+    """
+    groups = scores_df.groupby(["horizon_days", "tenor"], sort=False)["pit"]
+    calibration_df = groups.agg(n_windows="size", pit_mean="mean", pit_std="std")
+    for level in coverage_levels:
+        inside = scores_df["pit"].between((1 - level) / 2, (1 + level) / 2)
+        calibration_df[f"coverage_{level:g}"] = inside.groupby([scores_df["horizon_days"], scores_df["tenor"]], sort=False).mean()
+    calibration_df = calibration_df.reset_index()
+
+    edges = np.round(np.linspace(0.0, 1.0, pit_bins + 1), 12)
+    bins = np.clip(np.searchsorted(edges, scores_df["pit"], side="right") - 1, 0, pit_bins - 1)
+    counts = pd.crosstab([scores_df["horizon_days"], scores_df["tenor"]], bins)
+    counts = counts.reindex(index=pd.MultiIndex.from_frame(calibration_df[["horizon_days", "tenor"]]), columns=range(pit_bins), fill_value=0)
+    histogram_df = counts.stack().reset_index()
+    histogram_df.columns = ["horizon_days", "tenor", "bin", "count"]
+    histogram_df["bin_lower"] = edges[histogram_df["bin"]]
+    histogram_df["bin_upper"] = edges[histogram_df["bin"] + 1]
+    histogram_df["frequency"] = histogram_df["count"] / histogram_df.groupby(["horizon_days", "tenor"])["count"].transform("sum")
+    return calibration_df, histogram_df.drop(columns="bin")
+
+def save_walk_forward_reports(config, scores_df, calibration_df, histogram_df):
+    """Saves the walk-forward scores, coverage summary and PIT histograms to CSV files.
+    Args:
+        config: Configuration dictionary containing paths.
+        scores_df (pd.DataFrame): Per-window scores.
+        calibration_df (pd.DataFrame): Coverage and PIT moments per horizon and tenor.
+        histogram_df (pd.DataFrame): PIT histogram per horizon and tenor.
+    """
+    reports_dir = config["data_directory"]["reports"]
+    os.makedirs(reports_dir, exist_ok=True)
+    scores_df.to_csv(os.path.join(reports_dir, "walk_forward_scores.csv"), index=False)
+    calibration_df.to_csv(os.path.join(reports_dir, "walk_forward_calibration.csv"), index=False)
+    histogram_df.to_csv(os.path.join(reports_dir, "walk_forward_pit_histogram.csv"), index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import numpy as np
+from nelson_siegel import fit_nss_batch, nss_factor_loadings
+
+TENOR_YEARS = np.array([1 / 12, 0.25, 0.5, 1, 2, 3, 5, 7, 10, 20, 30])
+TAU1_GRID = np.geomspace(0.25, 10.0, 30)
+TAU2_GRID = np.geomspace(1.0, 30.0, 25)
+
+def drifting_nss_curves(n_dates=500, seed=0):
+    """NSS curves whose decay parameters and betas follow random walks, plus 1bp-scale noise."""
+    rng = np.random.default_rng(seed)
+    tau1 = np.clip(1.5 * np.exp(np.cumsum(rng.normal(0, 0.05, n_dates))), 0.3, 8.0)
+    tau2 = np.clip(tau1 * rng.uniform(2, 6) + np.cumsum(rng.normal(0, 0.2, n_dates)), 1.0, 28.0)
+    betas = np.column_stack([
+        4 + np.cumsum(rng.normal(0, 0.02, n_dates)),
+        -2 + np.cumsum(rng.normal(0, 0.03, n_dates)),
+        np.cumsum(rng.normal(0, 0.1, n_dates)),
+        np.cumsum(rng.normal(0, 0.1, n_dates)),
+    ])
+    X = nss_factor_loadings(TENOR_YEARS[None, :], tau1[:, None], tau2[:, None])
+    return np.einsum("nkp,np->nk", X, betas) + rng.normal(0, 0.01, (n_dates, len(TENOR_YEARS)))
+
+def test_warm_start_rmse_close_to_full_grid():
+    curves = drifting_nss_curves()
+    _, full_rmse = fit_nss_batch(curves, TENOR_YEARS, tau1_grid=TAU1_GRID, tau2_grid=TAU2_GRID, warm_start_radius=None)
+    _, warm_rmse = fit_nss_batch(curves, TENOR_YEARS, tau1_grid=TAU1_GRID, tau2_grid=TAU2_GRID, warm_start_radius=2)
+
+    assert warm_rmse.mean() <= full_rmse.mean() * 1.02
+    assert np.percentile(warm_rmse / full_rmse, 95) <= 1.25
+
+def test_warm_start_matches_full_grid_on_reseed_dates():
+    curves = drifting_nss_curves(n_dates=100)
+    full_params, _ = fit_nss_batch(curves, TENOR_YEARS, tau1_grid=TAU1_GRID, tau2_grid=TAU2_GRID, warm_start_radius=None)
+    warm_params, _ = fit_nss_batch(curves, TENOR_YEARS, tau1_grid=TAU1_GRID, tau2_grid=TAU2_GRID, warm_start_radius=2, reseed_every=10)
+
+    np.testing.assert_allclose(warm_params[::10], full_params[::10])
+
+def test_warm_start_simulated_paths_close_to_full_grid():
+    curves = np.stack([drifting_nss_curves(n_dates=200, seed=s) for s in range(8)], axis=1)
+    _, full_rmse = fit_nss_batch(curves, TENOR_YEARS, tau1_grid=TAU1_GRID, tau2_grid=TAU2_GRID, warm_start_radius=None)
+    warm_params, warm_rmse = fit_nss_batch(curves, TENOR_YEARS, tau1_grid=TAU1_GRID, tau2_grid=TAU2_GRID, warm_start_radius=2)
+
+    assert warm_params.shape == (200, 8, 6)
+    assert warm_rmse.mean() <= full_rmse.mean() * 1.02
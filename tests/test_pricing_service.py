@@ -0,0 +1,99 @@
+import copy
+import json
+import threading
+import urllib.error
+import urllib.request
+import numpy as np
+import pandas as pd
+import pytest
+from config_loader import load_config
+from bond_analytics import price_duration_convexity
+from key_rate_duration import compute_krd_vector
+from pricing_service import create_service, serve, stop_service
+
+TENORS = ["1MO", "3MO", "6MO", "1Y", "2Y", "3Y", "5Y", "7Y", "10Y", "20Y", "30Y"]
+YIELDS = [0.030, 0.031, 0.032, 0.033, 0.034, 0.035, 0.037, 0.038, 0.040, 0.042, 0.043]
+BOND = {"settlement_date": "2024-01-10", "maturity_date": "2034-01-10", "coupon_rate": 0.04, "frequency": 2, "face_value": 100}
+
+@pytest.fixture
+def service_url(tmp_path):
+    """Runs the pricing service on a free port over a small cleaned_data.csv whose last curve is YIELDS."""
+    dates = pd.bdate_range("2024-01-02", "2024-01-05")
+    curves = pd.DataFrame([np.array(YIELDS) + 0.001 * i for i in range(-len(dates) + 1, 1)], index=pd.Index(dates, name="date"), columns=TENORS)
+    curves.to_csv(tmp_path / "cleaned_data.csv")
+
+    config = copy.deepcopy(load_config())
+    config["data_directory"]["processed"] = str(tmp_path)
+    config["pricing_service"]["load_simulated_cube"] = False
+    service = create_service(config)
+    server = serve(service, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    stop_service(service, server)
+    thread.join()
+
+def request(url, body=None):
+    """Sends a GET (or a POST with a JSON body) and returns the status and decoded response."""
+    data = None if body is None else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+def reference_curve():
+    """The latest curve in the layout expected by price_duration_convexity."""
+    return pd.DataFrame([YIELDS], index=pd.DatetimeIndex(["2024-01-05"], name="date"), columns=TENORS)
+
+def reference_args():
+    """Bond terms of BOND in the positional order of price_duration_convexity and compute_krd_vector."""
+    return (
+        pd.Timestamp(BOND["settlement_date"]),
+        pd.Timestamp(BOND["maturity_date"]),
+        BOND["coupon_rate"],
+        BOND["frequency"],
+        BOND["face_value"],
+        "following",
+        "ACT/365",
+    )
+
+def test_price_matches_price_duration_convexity(service_url):
+    status, result = request(service_url + "/price", dict(BOND, business_day_convention="following", day_count_convention="ACT/365"))
+    expected = price_duration_convexity(reference_curve(), *reference_args())
+    assert status == 200
+    assert result["curve_date"] == "2024-01-05"
+    assert result["price"] == pytest.approx(expected["price"], rel=1e-10)
+    assert result["modified_duration"] == pytest.approx(expected["modified_duration"], rel=1e-10)
+    assert result["convexity"] == pytest.approx(expected["convexity"], rel=1e-10)
+
+def test_krd_matches_compute_krd_vector(service_url):
+    tenors = ["2Y", "5Y", "10Y"]
+    body = dict(BOND, business_day_convention="following", day_count_convention="ACT/365", tenors=tenors, shock_size_bp=1.0)
+    status, result = request(service_url + "/krd", body)
+    expected = compute_krd_vector(reference_curve(), tenors, *reference_args(), shock_size_bp=1.0)
+    assert status == 200
+    assert list(result["krd"]) == tenors
+    for tenor in tenors:
+        assert result["krd"][tenor] == pytest.approx(expected[tenor], rel=1e-6)
+
+def test_non_object_body_is_rejected(service_url):
+    status, result = request(service_url + "/price", [BOND])
+    assert status == 400
+    assert "JSON object" in result["error"]
+
+def test_string_tenors_are_rejected(service_url):
+    status, result = request(service_url + "/krd", dict(BOND, tenors="5Y"))
+    assert status == 400
+    assert "tenors must be a list" in result["error"]
+
+def test_metrics_count_both_statuses(service_url):
+    request(service_url + "/price", BOND)
+    request(service_url + "/price", BOND)
+    request(service_url + "/price", "not a bond")
+    status, metrics = request(service_url + "/metrics")
+    price = metrics["endpoints"]["price"]
+    assert status == 200
+    assert price["count"] == 3
+    assert price["status"]["200"]["count"] == 2
+    assert price["status"]["400"]["count"] == 1
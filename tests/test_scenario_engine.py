@@ -0,0 +1,23 @@
+import pandas as pd
+import pytest
+from scenario_engine import resolve_base_date
+
+# Business days only, as in cleaned_data.csv
+DATES = pd.bdate_range("2024-01-01", "2024-01-31")
+
+def test_weekend_base_date_resolves_to_previous_friday():
+    assert resolve_base_date(DATES, "2024-01-13") == pd.Timestamp("2024-01-12")
+    assert resolve_base_date(DATES, "2024-01-14") == pd.Timestamp("2024-01-12")
+
+def test_business_day_base_date_is_kept():
+    assert resolve_base_date(DATES, "2024-01-10") == pd.Timestamp("2024-01-10")
+
+def test_missing_base_date_uses_last_curve():
+    assert resolve_base_date(DATES, None) == DATES[-1]
+
+def test_base_date_after_last_curve_uses_last_curve():
+    assert resolve_base_date(DATES, "2024-03-01") == DATES[-1]
+
+def test_base_date_before_first_curve_raises():
+    with pytest.raises(ValueError, match="No cleaned curve on or before"):
+        resolve_base_date(DATES, "2023-12-31")